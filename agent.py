@@ -2,6 +2,7 @@ from typing import Optional
 
 from rlbot.agents.base_agent import BaseAgent, GameTickPacket, SimpleControllerState
 
+from data.lookup_table import preload_tables
 from maneuvers.kickoffs.kickoff import Kickoff
 from maneuvers.maneuver import Maneuver
 from rlutilities.linear_algebra import vec3
@@ -33,6 +34,7 @@ class BotimusPrime(BaseAgent):
         self.info.set_mode("soccar")
         self.info.read_field_info(self.get_field_info())
         self.draw = DrawingTool(self.renderer, self.team)
+        preload_tables()  # rather than on the first tick that needs them
 
     def is_hot_reload_enabled(self):
         return False
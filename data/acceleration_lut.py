@@ -1,7 +1,9 @@
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple
 
-from data.lookup_table import LookupTable
+from data.lookup_table import LazyTables, LookupTable
 
 
 class AccelerationLUT(LookupTable):
@@ -27,12 +29,21 @@ class AccelerationLUT(LookupTable):
         time_limit_reached: bool = False
         distance_limit_reached: bool = False
 
-    def simulate_until_limit(self,
-                             initial_speed: float,
-                             time_limit: Optional[float] = None,
-                             distance_limit: Optional[float] = None,
-                             speed_limit: Optional[float] = None) -> LookupResult:
-
+    @dataclass
+    class BatchLookupResult:
+        speeds_reached: array  # type: ignore[type-arg]
+        times_passed: array  # type: ignore[type-arg]
+        distances_traveled: array  # type: ignore[type-arg]
+
+        speed_limits_reached: List[bool]
+        time_limits_reached: List[bool]
+        distance_limits_reached: List[bool]
+
+    @staticmethod
+    def _check_limits(initial_speed: float,
+                      time_limit: Optional[float],
+                      distance_limit: Optional[float],
+                      speed_limit: Optional[float]) -> None:
         # at least one limit must be set
         assert time_limit is not None or distance_limit is not None or speed_limit is not None
 
@@ -47,8 +58,114 @@ class AccelerationLUT(LookupTable):
         if speed_limit is not None:
             assert speed_limit > initial_speed
 
+    @staticmethod
+    def position_of(column: List[float], value: float) -> float:
+        """Fractional row at which an increasing column reaches `value`, clamped to the table."""
+        index = bisect_left(column, value)
+        if index == 0:
+            return 0.0
+        if index == len(column):
+            return len(column) - 1.0
+        before = column[index - 1]
+        return index - 1 + (value - before) / (column[index] - before)
+
+    @staticmethod
+    def value_at(column: List[float], position: float) -> float:
+        """Column value at a fractional row, linearly interpolated."""
+        index = int(position)
+        if index >= len(column) - 1:
+            return column[-1]
+        return column[index] + (column[index + 1] - column[index]) * (position - index)
+
+    def simulate_until_limit(self,
+                             initial_speed: float,
+                             time_limit: Optional[float] = None,
+                             distance_limit: Optional[float] = None,
+                             speed_limit: Optional[float] = None,
+                             interpolate: bool = True) -> LookupResult:
+        """
+        Accelerate from `initial_speed` until the first of the given limits is reached, or the table ends.
+        Values are interpolated between the table rows, unless `interpolate` is False,
+        then they snap to the first row at or past the start and each limit.
+        """
+        self._check_limits(initial_speed, time_limit, distance_limit, speed_limit)
+
+        if not interpolate:
+            return self._simulate_until_limit_snapped(initial_speed, time_limit, distance_limit, speed_limit)
+
+        return self.LookupResult(*self._interpolate_until_limit(initial_speed, time_limit, distance_limit, speed_limit))
+
+    def simulate_until_limit_batch(self,
+                                   initial_speeds: Sequence[float],
+                                   time_limits: Optional[Sequence[float]] = None,
+                                   distance_limits: Optional[Sequence[float]] = None,
+                                   speed_limits: Optional[Sequence[float]] = None) -> BatchLookupResult:
+        """
+        simulate_until_limit (interpolated) for many queries at once, e.g. one per ball slice or boost pad.
+        Each given limits sequence has one limit per initial speed.
+        """
+        count = len(initial_speeds)
+        for limits in (time_limits, distance_limits, speed_limits):
+            assert limits is None or len(limits) == count
+
+        result = self.BatchLookupResult(array("d"), array("d"), array("d"), [], [], [])
+        simulate, check_limits = self._interpolate_until_limit, self._check_limits
+        for i in range(count):
+            time_limit = None if time_limits is None else time_limits[i]
+            distance_limit = None if distance_limits is None else distance_limits[i]
+            speed_limit = None if speed_limits is None else speed_limits[i]
+            check_limits(initial_speeds[i], time_limit, distance_limit, speed_limit)
+            speed, time, distance, speed_reached, time_reached, distance_reached = simulate(
+                initial_speeds[i], time_limit, distance_limit, speed_limit
+            )
+            result.speeds_reached.append(speed)
+            result.times_passed.append(time)
+            result.distances_traveled.append(distance)
+            result.speed_limits_reached.append(speed_reached)
+            result.time_limits_reached.append(time_reached)
+            result.distance_limits_reached.append(distance_reached)
+        return result
+
+    def _interpolate_until_limit(self,
+                                 initial_speed: float,
+                                 time_limit: Optional[float],
+                                 distance_limit: Optional[float],
+                                 speed_limit: Optional[float]) -> Tuple[float, float, float, bool, bool, bool]:
+        """The LookupResult fields, in order, with values interpolated between the table rows."""
+        times, distances, speeds = self.times, self.distances, self.speeds
+        position_of, value_at = self.position_of, self.value_at
+        last = len(times) - 1.0
+
+        start = position_of(speeds, initial_speed)
+        initial_time = value_at(times, start)
+        initial_distance = value_at(distances, start)
+
+        time_limit_position = distance_limit_position = speed_limit_position = last
+        if time_limit is not None:
+            time_limit_position = position_of(times, initial_time + time_limit)
+        if distance_limit is not None:
+            distance_limit_position = position_of(distances, initial_distance + distance_limit)
+        if speed_limit is not None:
+            speed_limit_position = position_of(speeds, speed_limit)
+
+        # use the soonest reached limit
+        final = max(min(time_limit_position, distance_limit_position, speed_limit_position), start)
+
+        return (
+            value_at(speeds, final),
+            value_at(times, final) - initial_time,
+            value_at(distances, final) - initial_distance,
+            speed_limit is not None and final == speed_limit_position < last,
+            time_limit is not None and final == time_limit_position < last,
+            distance_limit is not None and final == distance_limit_position < last,
+        )
+
+    def _simulate_until_limit_snapped(self,
+                                      initial_speed: float,
+                                      time_limit: Optional[float],
+                                      distance_limit: Optional[float],
+                                      speed_limit: Optional[float]) -> LookupResult:
         starting_index = self.find_index(self.speeds, initial_speed)
-        # TODO: Interpolate
         initial_time = self.times[starting_index]
         initial_distance = self.distances[starting_index]
 
@@ -66,7 +183,6 @@ class AccelerationLUT(LookupTable):
         if final_index < starting_index:
             final_index = starting_index
 
-        # TODO: Interpolate values
         return self.LookupResult(
             speed_reached=self.speeds[final_index],
             time_passed=self.times[final_index] - initial_time,
@@ -89,5 +205,17 @@ class AccelerationLUT(LookupTable):
         )
 
 
-BOOST = AccelerationLUT('acceleration/boost.csv')
-THROTTLE = AccelerationLUT('acceleration/throttle.csv')
+# BOOST and THROTTLE are loaded on first access, so importing this module is cheap
+TABLES = LazyTables({
+    'BOOST': lambda: AccelerationLUT('acceleration/boost.csv'),
+    'THROTTLE': lambda: AccelerationLUT('acceleration/throttle.csv'),
+})
+
+BOOST: AccelerationLUT
+THROTTLE: AccelerationLUT
+
+
+def __getattr__(name: str) -> AccelerationLUT:
+    if name in TABLES:
+        return TABLES.get(name)  # type: ignore[no-any-return]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,149 @@
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+from data import acceleration_lut
+from data.acceleration_lut import AccelerationLUT
+from data.lookup_table import LazyTables
+
+
+def drive_times(initial_speed: float, boost: float, distances: Sequence[float]) -> array:  # type: ignore[type-arg]
+    """
+    Time to drive each of `distances` in a straight line, using the acceleration tables interpolated between
+    their rows: boost while there is boost, then throttle until 1410 uu/s, then keep the speed reached.
+    Each phase is one batched lookup for all the distances.
+    :param initial_speed: Forward speed at the start
+    :param boost: Boost amount available, 0 to drive without boosting
+    """
+    times = array("d", bytes(8 * len(distances)))
+    speeds = array("d", [initial_speed]) * len(distances)
+    left = array("d", distances)
+    distance_limit_reached = [False] * len(distances)
+
+    def accelerate(table: AccelerationLUT, driving: List[int], time_limit: Optional[float]) -> None:
+        if not driving:
+            return
+        result = table.simulate_until_limit_batch(
+            [speeds[i] for i in driving],
+            time_limits=None if time_limit is None else [time_limit] * len(driving),
+            distance_limits=[left[i] for i in driving],
+        )
+        for j, i in enumerate(driving):
+            left[i] -= result.distances_traveled[j]
+            times[i] += result.times_passed[j]
+            speeds[i] = result.speeds_reached[j]
+            distance_limit_reached[i] = result.distance_limits_reached[j]
+
+    moving = [i for i in range(len(distances)) if left[i] > 0]
+    if boost > 0:
+        accelerate(acceleration_lut.BOOST, moving, boost / 33.33)
+    accelerate(acceleration_lut.THROTTLE, [i for i in moving if left[i] > 0 and speeds[i] < 1410], None)
+
+    for i in moving:
+        if not distance_limit_reached[i]:
+            times[i] += left[i] / max(speeds[i], 1.0)
+    return times
+
+
+def drive_time(initial_speed: float, boost: float, distance: float) -> float:
+    """drive_times for a single distance."""
+    return drive_times(initial_speed, boost, [distance])[0]
+
+
+class ArrivalCurve:
+    """Drive time over distance for one initial speed and boost amount, sampled every DISTANCE_STEP,
+    and every SHORT_DISTANCE_STEP below SHORT_DISTANCE, where a slow car's time is far from linear."""
+
+    __slots__ = ("times", "end_speed", "short_times")
+
+    def __init__(self, times: array, end_speed: float, short_times: array):  # type: ignore[type-arg]
+        self.times = times
+        self.end_speed = end_speed  # speed kept after the last sample
+        self.short_times = short_times
+
+    def time(self, distance: float) -> float:
+        if distance <= 0:
+            return 0.0
+        if distance < ArrivalTable.SHORT_DISTANCE:
+            position = distance / ArrivalTable.SHORT_DISTANCE_STEP
+            index = int(position)
+            short_times = self.short_times
+            return short_times[index] + (short_times[index + 1] - short_times[index]) * (position - index)
+        position = distance / ArrivalTable.DISTANCE_STEP
+        index = int(position)
+        last = len(self.times) - 1
+        if index >= last:
+            return self.times[last] + (distance - last * ArrivalTable.DISTANCE_STEP) / max(self.end_speed, 1.0)
+        ratio = position - index
+        return self.times[index] + (self.times[index + 1] - self.times[index]) * ratio
+
+
+class BlendedArrivalCurve:
+    """Weighted sum of the grid curves around a speed and boost amount."""
+
+    __slots__ = ("parts",)
+
+    def __init__(self, parts: List[Tuple[float, ArrivalCurve]]):
+        self.parts = parts
+
+    def time(self, distance: float) -> float:
+        return sum(weight * curve.time(distance) for weight, curve in self.parts)
+
+
+class ArrivalTable:
+    """
+    Drive time curves on a grid of initial speeds and boost amounts, generated from the acceleration tables,
+    so that estimating the arrival time at many distances is one interpolation per distance.
+    """
+
+    SPEED_STEP = 100.0
+    MAX_SPEED = 2300.0
+    BOOST_STEP = 5.0  # the time bends sharply at the amount that lasts until the throttle's top speed
+    MAX_BOOST = 100.0
+    DISTANCE_STEP = 100.0
+    MAX_DISTANCE = 12800.0
+    SHORT_DISTANCE_STEP = 10.0
+    SHORT_DISTANCE = 200.0
+
+    def __init__(self):
+        self.speed_count = int(self.MAX_SPEED / self.SPEED_STEP) + 1
+        self.boost_count = int(self.MAX_BOOST / self.BOOST_STEP) + 1
+        short_count = int(self.SHORT_DISTANCE / self.SHORT_DISTANCE_STEP) + 1
+        distances = [i * self.SHORT_DISTANCE_STEP for i in range(short_count)]
+        distances += [i * self.DISTANCE_STEP for i in range(int(self.MAX_DISTANCE / self.DISTANCE_STEP) + 1)]
+
+        self.curves: List[ArrivalCurve] = []
+        for speed_index in range(self.speed_count):
+            speed = max(speed_index * self.SPEED_STEP, 1.0)
+            for boost_index in range(self.boost_count):
+                boost = boost_index * self.BOOST_STEP
+                short_times_and_times = drive_times(speed, boost, distances)
+                times = short_times_and_times[short_count:]
+                # past the last sample the speed no longer changes, so the slope of the last step gives it
+                last_step = times[-1] - times[-2]
+                end_speed = self.DISTANCE_STEP / last_step if last_step > 0 else self.MAX_SPEED
+                self.curves.append(ArrivalCurve(times, end_speed, short_times_and_times[:short_count]))
+
+    def curve(self, initial_speed: float, boost: float) -> BlendedArrivalCurve:
+        """Drive time curve for any speed and boost amount, bilinearly interpolated between the grid curves."""
+        speed_position = min(max(initial_speed, 0.0), self.MAX_SPEED) / self.SPEED_STEP
+        boost_position = min(max(boost, 0.0), self.MAX_BOOST) / self.BOOST_STEP
+        s0 = min(int(speed_position), self.speed_count - 2)
+        b0 = min(int(boost_position), self.boost_count - 2)
+        ds = speed_position - s0
+        db = boost_position - b0
+
+        parts = [
+            ((1 - ds) * (1 - db), self.curves[s0 * self.boost_count + b0]),
+            ((1 - ds) * db, self.curves[s0 * self.boost_count + b0 + 1]),
+            (ds * (1 - db), self.curves[(s0 + 1) * self.boost_count + b0]),
+            (ds * db, self.curves[(s0 + 1) * self.boost_count + b0 + 1]),
+        ]
+        return BlendedArrivalCurve([(weight, curve) for weight, curve in parts if weight > 0])
+
+
+TABLES = LazyTables({"arrival": ArrivalTable})
+
+
+def arrival_table() -> ArrivalTable:
+    """The arrival table, generated on first use."""
+    return TABLES.get("arrival")  # type: ignore[no-any-return]
@@ -0,0 +1,75 @@
+"""
+Build the motion tables from the car model, as binary table files that LookupTable loads directly:
+
+    python -m data.build_tables --dt 0.004 --float32
+
+The straight-line tables (boost, throttle, coast, brake, reverse) are sampled every `--dt` seconds,
+so their resolution, and with `--float32` their precision, can be traded against memory.
+The turning and jump tables are written on the grids of TurningTable and JumpTable.
+"""
+
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from data import car_model, jump_table, turning_table
+from data.lookup_table import TABLE_SUFFIX, write_table
+
+DEFAULT_OUTPUT = Path(__file__).absolute().parent / "generated"
+DEFAULT_DT = 1 / 120
+DEFAULT_DURATION = 5.0
+TABLES = [*car_model.MOTIONS, "turning", "jump"]
+
+
+def build(
+    output: Path = DEFAULT_OUTPUT,
+    tables: Sequence[str] = TABLES,
+    dt: float = DEFAULT_DT,
+    duration: float = DEFAULT_DURATION,
+    typecode: str = "d",
+) -> List[Path]:
+    """Write the given tables to `output` as <name>.blut files and return their paths."""
+    output.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in tables:
+        metadata: Dict[str, object] = {"table": name, "model": car_model.__name__}
+        if name == "turning":
+            columns = turning_table.grid_columns()
+        elif name == "jump":
+            columns = jump_table.grid_columns()
+        else:
+            columns = car_model.simulate_motion(name, dt, duration)
+            metadata.update(dt=dt, duration=duration)
+        path = output / (name + TABLE_SUFFIX)
+        write_table(path, columns, metadata, typecode)
+        paths.append(path)
+    return paths
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build Botimus motion tables from the car model")
+    parser.add_argument("tables", nargs="*", metavar="table",
+                        help=f"tables to build, out of {', '.join(TABLES)} (default: all)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="directory to write the tables to")
+    parser.add_argument("--dt", type=float, default=DEFAULT_DT, help="seconds between straight-line samples")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="seconds of straight-line motion to sample")
+    parser.add_argument("--float32", action="store_true", help="store values as float32 to halve the size")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = _build_arg_parser()
+    args = parser.parse_args(argv)
+    unknown = set(args.tables) - set(TABLES)
+    if unknown:
+        parser.error(f"unknown tables: {', '.join(sorted(unknown))}")
+    if args.dt <= 0 or args.duration <= 0:
+        parser.error("--dt and --duration must be positive")
+    for path in build(args.output, args.tables or TABLES, args.dt, args.duration, "f" if args.float32 else "d"):
+        print(f"wrote {path} ({path.stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
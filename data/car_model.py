@@ -0,0 +1,92 @@
+"""
+Simple model of a car driving on flat ground, used to generate the motion tables offline.
+"""
+
+import math
+from typing import Callable, Dict, List
+
+THROTTLE_ACCELERATION = 1600.0
+BOOST_ACCELERATION = 991.666
+BRAKE_ACCELERATION = 3500.0
+COAST_ACCELERATION = 525.0
+MAX_THROTTLE_SPEED = 1410.0
+MAX_SPEED = 2300.0
+
+# max turning curvature of a car by speed, the same table as rlutilities' Drive.max_turning_curvature
+CURVATURE_SPEEDS = [0.0, 500.0, 1000.0, 1500.0, 1750.0, 2300.0]
+CURVATURES = [0.00690, 0.00398, 0.00235, 0.001375, 0.00110, 0.00088]
+
+
+def max_curvature(speed: float) -> float:
+    speed = min(max(speed, CURVATURE_SPEEDS[0]), CURVATURE_SPEEDS[-1])
+    for i in range(1, len(CURVATURE_SPEEDS)):
+        if speed <= CURVATURE_SPEEDS[i]:
+            ratio = (speed - CURVATURE_SPEEDS[i - 1]) / (CURVATURE_SPEEDS[i] - CURVATURE_SPEEDS[i - 1])
+            return CURVATURES[i - 1] + (CURVATURES[i] - CURVATURES[i - 1]) * ratio
+    return CURVATURES[-1]
+
+
+def throttle_acceleration(speed: float) -> float:
+    if speed < 1400:
+        return THROTTLE_ACCELERATION - 1440 * speed / 1400
+    if speed < MAX_THROTTLE_SPEED:
+        return 160 * (MAX_THROTTLE_SPEED - speed) / 10
+    return 0.0
+
+
+def throttle(speed: float, dt: float, speed_limit: float = MAX_THROTTLE_SPEED) -> float:
+    """Speed after throttling for `dt`, without going over `speed_limit` (but keeping any speed above it)."""
+    if speed >= speed_limit:
+        return speed
+    return min(speed + throttle_acceleration(speed) * dt, speed_limit)
+
+
+def boost(speed: float, dt: float) -> float:
+    """Speed after throttling and boosting for `dt`."""
+    return min(speed + (throttle_acceleration(speed) + BOOST_ACCELERATION) * dt, MAX_SPEED)
+
+
+def coast(speed: float, dt: float) -> float:
+    """Speed after rolling without throttle for `dt`."""
+    return max(speed - COAST_ACCELERATION * dt, 0.0)
+
+
+def brake(speed: float, dt: float) -> float:
+    """Speed after braking (throttle against the direction of travel) for `dt`."""
+    return max(speed - BRAKE_ACCELERATION * dt, 0.0)
+
+
+# speed update of each straight-line motion, by name. Reversing accelerates like throttling,
+# so the reverse table is the throttle table driven backwards, with speeds and distances as magnitudes.
+MOTIONS: Dict[str, Callable[[float, float], float]] = {
+    "boost": boost,
+    "throttle": throttle,
+    "coast": coast,
+    "brake": brake,
+    "reverse": throttle,
+}
+
+# speed each motion starts from
+INITIAL_SPEEDS = {"boost": 0.0, "throttle": 0.0, "coast": MAX_SPEED, "brake": MAX_SPEED, "reverse": 0.0}
+
+
+def simulate_motion(motion: str, dt: float, duration: float) -> Dict[str, List[float]]:
+    """
+    Time, distance and speed of a car doing `motion` in a straight line, sampled every `dt` for `duration`
+    or until it stops. The columns are named like the captured acceleration CSVs,
+    so AccelerationLUT can read the accelerating ones.
+    """
+    update = MOTIONS[motion]
+    speed = INITIAL_SPEEDS[motion]
+    time = distance = 0.0
+    times, distances, speeds = [time], [distance], [speed]
+    for step in range(1, math.floor(duration / dt + 1e-9) + 1):
+        new_speed = update(speed, dt)
+        distance += (speed + new_speed) / 2 * dt
+        speed = new_speed
+        times.append(step * dt)
+        distances.append(distance)
+        speeds.append(speed)
+        if speed == 0.0:
+            break
+    return {"time": times, "car_loc_x": distances, "car_vel_x": speeds}
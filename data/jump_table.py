@@ -0,0 +1,158 @@
+"""
+Time for a jumping car to rise by a given height, and its vertical velocity when it gets there,
+by first jump hold duration, delay of the second jump and initial vertical velocity.
+
+The table in jump/jump.csv is generated offline by sweeping tools.jump_sim.BatchJumpSim over those parameters.
+Heights above the apex of a jump are stored as reached at the apex, with no vertical velocity left.
+Regenerate it with
+
+    python -m data.jump_table
+"""
+
+import csv
+import math
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from data.lookup_table import LazyTables, LookupTable
+from tools.jump_sim import BatchJumpSim, JumpState, height_curve
+
+SIMULATION_DT = 1 / 120
+
+
+def simulate_jumps(jumps: Sequence[Tuple[float, Optional[float], float]]) -> List[List[JumpState]]:
+    """(time, height, vertical velocity) of an upright car every tick of each (first hold duration,
+    second jump delay, initial vertical velocity) jump, until its apex or landing.
+    Jumps without a second jump delay only jump once."""
+    simulation = BatchJumpSim(
+        [hold for hold, _, _ in jumps],
+        [math.inf if delay is None else hold + delay for hold, delay, _ in jumps],
+        initial_velocities=[(0.0, 0.0, velocity) for _, _, velocity in jumps],
+    )
+    return simulation.simulate(SIMULATION_DT)
+
+
+def simulate_jump(
+    first_hold_duration: float, second_jump_delay: Optional[float], initial_vertical_velocity: float
+) -> List[JumpState]:
+    return simulate_jumps([(first_hold_duration, second_jump_delay, initial_vertical_velocity)])[0]
+
+
+class JumpTable(LookupTable):
+    """
+    Jump times and vertical velocities on a regular (hold duration, second jump delay, initial vertical velocity,
+    height) grid. The first delay layer is for a single jump, the others are DELAY_STEP apart from DELAY_STEP on.
+    """
+
+    HOLD_STEP = 0.05
+    HOLD_COUNT = 4  # 0.05 to 0.2, the longest hold that still accelerates
+    DELAY_STEP = 0.025
+    DELAY_COUNT = 13  # no second jump, then 0.025 to 0.3
+    VELOCITY_MIN = -200.0
+    VELOCITY_STEP = 200.0
+    VELOCITY_COUNT = 4
+    HEIGHT_STEP = 20.0
+    HEIGHT_COUNT = 31
+
+    def __init__(self, file_name: str = "jump/jump.csv"):
+        super().__init__(file_name)
+        self.times = array("d", self.get_column("time"))
+        self.velocities = array("d", self.get_column("vertical_velocity"))
+        assert len(self.times) == self.HOLD_COUNT * self.DELAY_COUNT * self.VELOCITY_COUNT * self.HEIGHT_COUNT
+
+    @classmethod
+    def grid(cls) -> Tuple[List[float], List[Optional[float]], List[float], List[float]]:
+        """The hold durations, second jump delays, initial vertical velocities and heights of the grid."""
+        return (
+            [(i + 1) * cls.HOLD_STEP for i in range(cls.HOLD_COUNT)],
+            [None] + [i * cls.DELAY_STEP for i in range(1, cls.DELAY_COUNT)],
+            [cls.VELOCITY_MIN + i * cls.VELOCITY_STEP for i in range(cls.VELOCITY_COUNT)],
+            [i * cls.HEIGHT_STEP for i in range(cls.HEIGHT_COUNT)],
+        )
+
+    @staticmethod
+    def _axis(value: float, start: float, step: float, first: int, last: int) -> Tuple[int, float]:
+        """Grid index at or before `value` along an axis, clamped to [first, last], and the weight of the next."""
+        position = min(max((value - start) / step, float(first)), float(last))
+        index = min(int(position), last - 1) if last > first else first
+        return index, position - index
+
+    def lookup(
+        self,
+        height: float,
+        first_hold_duration: float = 0.2,
+        second_jump_delay: Optional[float] = None,
+        initial_vertical_velocity: float = 0.0,
+    ) -> Tuple[float, float]:
+        """
+        Time for the car to rise by `height`, and its vertical velocity then, interpolated between the grid points.
+        Heights above the apex give the time of the apex and no vertical velocity.
+        :param second_jump_delay: Time between the end of the first jump and the second one, None for a single jump
+        """
+        holds = self._axis(first_hold_duration, self.HOLD_STEP, self.HOLD_STEP, 0, self.HOLD_COUNT - 1)
+        if second_jump_delay is None:
+            delays = (0, 0.0)
+        else:
+            delays = self._axis(second_jump_delay, 0.0, self.DELAY_STEP, 1, self.DELAY_COUNT - 1)
+        velocities = self._axis(initial_vertical_velocity, self.VELOCITY_MIN, self.VELOCITY_STEP,
+                                0, self.VELOCITY_COUNT - 1)
+        heights = self._axis(height, 0.0, self.HEIGHT_STEP, 0, self.HEIGHT_COUNT - 1)
+
+        time = vertical_velocity = 0.0
+        for h, h_weight in ((holds[0], 1 - holds[1]), (holds[0] + 1, holds[1])):
+            for d, d_weight in ((delays[0], 1 - delays[1]), (delays[0] + 1, delays[1])):
+                for v, v_weight in ((velocities[0], 1 - velocities[1]), (velocities[0] + 1, velocities[1])):
+                    weight = h_weight * d_weight * v_weight
+                    if weight == 0:
+                        continue
+                    row = ((h * self.DELAY_COUNT + d) * self.VELOCITY_COUNT + v) * self.HEIGHT_COUNT + heights[0]
+                    time += weight * (self.times[row] + (self.times[row + 1] - self.times[row]) * heights[1])
+                    vertical_velocity += weight * (
+                        self.velocities[row] + (self.velocities[row + 1] - self.velocities[row]) * heights[1]
+                    )
+        return time, vertical_velocity
+
+    def time_to_height(self, height: float, **jump) -> float:
+        return self.lookup(height, **jump)[0]
+
+
+TABLES = LazyTables({"jump": JumpTable})
+
+
+def jump_table() -> JumpTable:
+    """The jump table, loaded on first use."""
+    return TABLES.get("jump")  # type: ignore[no-any-return]
+
+
+def grid_columns() -> Dict[str, List[float]]:
+    """The JumpTable grid with the simulated time and vertical velocity at every point."""
+    columns: Dict[str, List[float]] = {
+        "first_hold_duration": [], "second_jump_delay": [], "initial_vertical_velocity": [], "height": [],
+        "time": [], "vertical_velocity": [],
+    }
+    holds, delays, velocities, heights = JumpTable.grid()
+    jumps = [(hold, delay, velocity) for hold in holds for delay in delays for velocity in velocities]
+    for (hold, delay, velocity), states in zip(jumps, simulate_jumps(jumps)):
+        times, vertical_velocities = height_curve(states, heights)
+        for height, time, vertical_velocity in zip(heights, times, vertical_velocities):
+            columns["first_hold_duration"].append(round(hold, 6))
+            columns["second_jump_delay"].append(-1.0 if delay is None else round(delay, 6))
+            columns["initial_vertical_velocity"].append(velocity)
+            columns["height"].append(height)
+            columns["time"].append(round(time, 5))
+            columns["vertical_velocity"].append(round(vertical_velocity, 3))
+    return columns
+
+
+def generate(path: Path):
+    columns = grid_columns()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(list(columns))
+        writer.writerows(zip(*columns.values()))
+
+
+if __name__ == "__main__":
+    generate(Path(__file__).absolute().parent / "jump" / "jump.csv")
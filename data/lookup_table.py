@@ -1,7 +1,182 @@
 import csv
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
 from bisect import bisect_left
+from contextlib import suppress
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# binary table files, written by the table builder and as sidecars caching parsed CSVs:
+# magic, format version, header length, JSON header padded to 8 bytes, then the columns one after another
+TABLE_MAGIC = b"BLUT"
+TABLE_FORMAT_VERSION = 1
+TABLE_SUFFIX = ".blut"
+SIDECAR_SUFFIX = ".bin"
+_PREFIX = struct.Struct("<4sHxxI")
+
+Columns = Dict[str, Sequence[float]]
+
+# parsed columns by file path, shared by every table reading the same file
+_columns: Dict[Path, Columns] = {}
+_columns_lock = threading.Lock()
+
+
+def _csv_signature(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _parse_csv(path: Path) -> Dict[str, array]:  # type: ignore[type-arg]
+    with path.open("r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        names = next(reader, [])
+        columns = [array("d") for _ in names]
+        for row in reader:
+            for column, cell in zip(columns, row):
+                column.append(float(cell))
+    return dict(zip(names, columns))
+
+
+def write_table(path: Path, columns: Mapping[str, Sequence[float]], metadata: Optional[Dict[str, Any]] = None,
+                typecode: str = "d") -> None:
+    """
+    Write columns of equal length to a binary table file, replacing it atomically.
+    :param metadata: JSON-serializable description of how the table was made, kept in the header
+    :param typecode: "d" for float64 or "f" for float32 values, which halves the size
+    """
+    rows = len(next(iter(columns.values()), ()))
+    assert all(len(column) == rows for column in columns.values())
+    header = json.dumps({
+        "columns": list(columns),
+        "rows": rows,
+        "typecode": typecode,
+        "byteorder": sys.byteorder,
+        "metadata": metadata or {},
+    }).encode("utf-8")
+    header += b" " * (-(_PREFIX.size + len(header)) % 8)
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with temporary.open("wb") as file:
+            file.write(_PREFIX.pack(TABLE_MAGIC, TABLE_FORMAT_VERSION, len(header)) + header)
+            for column in columns.values():
+                array(typecode, column).tofile(file)
+        os.replace(temporary, path)
+    finally:
+        with suppress(OSError):
+            temporary.unlink()
+
+
+def read_table(path: Path) -> Tuple[Dict[str, Any], Columns]:
+    """
+    Metadata and columns of a binary table file. The columns are read-only views of the memory-mapped file.
+    Raises ValueError if the file is not a table of this format version.
+    """
+    with path.open("rb") as file:
+        if os.fstat(file.fileno()).st_size < _PREFIX.size:
+            raise ValueError(f"{path} is not a table file")
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, header_length = _PREFIX.unpack_from(mapped)
+    if magic != TABLE_MAGIC or version != TABLE_FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {TABLE_FORMAT_VERSION} table file")
+    header = json.loads(bytes(mapped[_PREFIX.size:_PREFIX.size + header_length]))
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError(f"{path} was written on a {header['byteorder']}-endian machine")
+
+    rows, typecode = header["rows"], header["typecode"]
+    size = array(typecode).itemsize * rows
+    offset = _PREFIX.size + header_length
+    if len(mapped) != offset + size * len(header["columns"]):
+        raise ValueError(f"{path} is truncated")
+    values = memoryview(mapped)
+    columns: Columns = {}
+    for name in header["columns"]:
+        columns[name] = values[offset:offset + size].cast(typecode)
+        offset += size
+    return header["metadata"], columns
+
+
+def _map_sidecar(sidecar: Path, signature: Tuple[int, int]) -> Columns:
+    """Columns from the sidecar of a CSV, or {} if it is missing, corrupt or stale."""
+    try:
+        metadata, columns = read_table(sidecar)
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return {}
+    if metadata.get("csv_mtime_ns") != signature[0] or metadata.get("csv_size") != signature[1]:
+        return {}
+    return columns
+
+
+def load_columns(path: Path) -> Columns:
+    """
+    All columns of a table file as sequences of floats, loaded once per process.
+    Binary table files are memory-mapped. CSV files are parsed, and the parsed columns are saved to
+    a binary sidecar next to the CSV, which later processes map instead, as long as the CSV keeps
+    the modification time and size it had when the sidecar was written.
+    """
+    with _columns_lock:
+        columns = _columns.get(path)
+        if columns is None and path.suffix == TABLE_SUFFIX:
+            columns = _columns[path] = read_table(path)[1]
+        elif columns is None:
+            signature = _csv_signature(path)
+            sidecar = path.with_name(path.name + SIDECAR_SUFFIX)
+            columns = _map_sidecar(sidecar, signature)
+            if not columns:
+                parsed = _parse_csv(path)
+                try:
+                    write_table(sidecar, parsed, {"csv_mtime_ns": signature[0], "csv_size": signature[1]})
+                except OSError:
+                    pass  # a read-only install, or another process has the sidecar mapped: parse again next time
+                columns = dict(parsed)
+            _columns[path] = columns
+        return columns
+
+
+class LazyTables:
+    """
+    Tables built on first access, by name. Thread-safe, and every instance is registered,
+    so preload_tables can build all of them up front.
+    """
+
+    def __init__(self, factories: Mapping[str, Callable[[], Any]]):
+        self._factories = dict(factories)
+        self._tables: Dict[str, Any] = {}
+        self._lock = threading.RLock()  # a table may be built from another one of the same registry
+        _registries.append(self)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._tables
+
+    def get(self, name: str) -> Any:
+        table = self._tables.get(name)
+        if table is None:
+            with self._lock:
+                table = self._tables.get(name)
+                if table is None:
+                    table = self._tables[name] = self._factories[name]()
+        return table
+
+    def preload(self) -> None:
+        for name in self._factories:
+            self.get(name)
+
+
+_registries: List[LazyTables] = []
+
+
+def preload_tables() -> None:
+    """Build every lazily loaded table of the modules imported so far, e.g. before the first tick."""
+    for registry in list(_registries):
+        registry.preload()
 
 
 class LookupTable:
@@ -9,18 +184,25 @@ class LookupTable:
     def __init__(self, file_name: str):
         self.file_name = file_name
 
+    @property
+    def path(self) -> Path:
+        return Path(__file__).absolute().parent / self.file_name
+
     def get_rows(self) -> List[dict[str, str]]:
-        data_folder = Path(__file__).absolute().parent
-        with (data_folder / self.file_name).open("r", encoding="utf-8", newline="") as file:
+        with self.path.open("r", encoding="utf-8", newline="") as file:
             return list(csv.DictReader(file))
 
+    def get_columns(self) -> Columns:
+        """All columns, shared with every other table of the same file, so they must not be modified."""
+        return load_columns(self.path)
+
     def get_column(self, name: str) -> List[float]:
         """
         Get all data in a column
         :param name: Name of the column
         :return: List of float values in the column
         """
-        return [float(row[name]) for row in self.get_rows()]
+        return list(self.get_columns()[name])
 
     @staticmethod
     def find_index(column: List[float], value: float) -> int:
@@ -0,0 +1,183 @@
+"""
+Time lost to turning towards a target, by speed, heading error and distance.
+
+The table in turning/turning.csv is generated offline from the car model in data.car_model driving to a target
+on the ground: full steering lock at the speed-dependent max curvature with throttle until facing the
+target, braking (or, when already slow, driving straight) while it is inside the turning circle, then
+throttle straight to it. The car may also brake to a slower turning speed first and hold it through the turn,
+whichever is quickest.
+Regenerate it with
+
+    python -m data.turning_table
+"""
+
+import csv
+import math
+from array import array
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from data.car_model import BRAKE_ACCELERATION, max_curvature, throttle
+from data.lookup_table import LazyTables, LookupTable
+
+MIN_TURNING_SPEED = 300.0
+REACH_RADIUS = 50.0
+SIMULATION_DT = 1 / 60
+MAX_SIMULATION_TIME = 10.0
+# speeds the car may brake to before turning, besides turning at the speed it has
+TURNING_SPEEDS = (MIN_TURNING_SPEED, 500.0, 800.0, 1200.0, 1700.0)
+
+
+def simulate_drive(speed: float, heading_error: float, distance: float, turning_speed: float = math.inf) -> float:
+    """Time for a car at `speed` to get within REACH_RADIUS of a target at `distance`,
+    `heading_error` radians off its forward direction, braking to `turning_speed` while not facing it."""
+    x = y = yaw = 0.0
+    target_x, target_y = distance * math.cos(heading_error), distance * math.sin(heading_error)
+    time = 0.0
+    dt = SIMULATION_DT
+    straightening = False
+    while time < MAX_SIMULATION_TIME:
+        dx, dy = target_x - x, target_y - y
+        if math.hypot(dx, dy) < REACH_RADIUS:
+            return time
+
+        angle = (math.atan2(dy, dx) - yaw + math.pi) % (2 * math.pi) - math.pi
+        curvature = max_curvature(speed)
+        max_turn = curvature * speed * dt
+        turn = min(max(angle, -max_turn), max_turn)
+
+        # with the target inside the turning circle, turning at full lock would only circle around it,
+        # so slow down to turn tighter, or drive straight without accelerating when already slow
+        side = 1.0 if angle >= 0 else -1.0
+        radius = 1 / curvature
+        center_x, center_y = x - math.sin(yaw) * radius * side, y + math.cos(yaw) * radius * side
+        target_from_center = math.hypot(target_x - center_x, target_y - center_y)
+        # keep driving straight until the target is well outside the circle, or it ends up right on its edge
+        straightening = straightening and target_from_center < 1.25 * radius
+        if abs(angle) > max_turn and speed > turning_speed:
+            speed = max(speed - BRAKE_ACCELERATION * dt, turning_speed)
+        elif straightening or (abs(angle) > max_turn and target_from_center < radius):
+            if speed > MIN_TURNING_SPEED:
+                speed = max(speed - BRAKE_ACCELERATION * dt, MIN_TURNING_SPEED)
+            else:
+                straightening = True
+                turn = 0.0
+                speed = throttle(speed, dt, MIN_TURNING_SPEED)
+        elif abs(angle) <= max_turn:
+            speed = throttle(speed, dt)
+        else:
+            # throttle through the turn, the car turns faster at speed even though the circle gets wider
+            speed = throttle(speed, dt)
+
+        yaw += turn
+        x += math.cos(yaw) * speed * dt
+        y += math.sin(yaw) * speed * dt
+        time += dt
+    return time
+
+
+def turning_time(speed: float, heading_error: float, distance: float) -> float:
+    """How much longer driving to the target takes than if it was straight ahead."""
+    time = simulate_drive(speed, heading_error, distance)
+    for turning_speed in TURNING_SPEEDS:
+        if turning_speed < speed:
+            time = min(time, simulate_drive(speed, heading_error, distance, turning_speed))
+    return max(time - simulate_drive(speed, 0.0, distance), 0.0)
+
+
+def turning_times(speed: float, heading_errors: Sequence[float], distance: float) -> List[float]:
+    """
+    turning_time at increasing heading errors, made non-decreasing: a target further to the side never takes
+    less time, so each time is capped by the ones after it. This hides the cases where the controller, which
+    does not plan ahead, circles a close target for seconds instead of backing off and turning once.
+    """
+    times = [turning_time(speed, heading_error, distance) for heading_error in heading_errors]
+    for i in range(len(times) - 2, -1, -1):
+        times[i] = min(times[i], times[i + 1])
+    return times
+
+
+class TurningTable(LookupTable):
+    """Turning times on a regular (speed, heading error, distance) grid, trilinearly interpolated."""
+
+    SPEED_STEP = 230.0
+    SPEED_COUNT = 11
+    HEADING_STEP = math.pi / 16
+    HEADING_COUNT = 17
+    DISTANCE_STEP = 300.0
+    DISTANCE_COUNT = 21
+
+    def __init__(self, file_name: str = "turning/turning.csv"):
+        super().__init__(file_name)
+        self.times = array("d", self.get_column("time"))
+        assert len(self.times) == self.SPEED_COUNT * self.HEADING_COUNT * self.DISTANCE_COUNT
+
+    def speed_layers(self, speed: float):
+        """Offsets of the two speed layers around `speed` and the weight of the upper one.
+        Constant for a car, so it can be computed once before many lookups."""
+        position = min(max(speed, 0.0) / self.SPEED_STEP, self.SPEED_COUNT - 1.0)
+        index = min(int(position), self.SPEED_COUNT - 2)
+        layer_size = self.HEADING_COUNT * self.DISTANCE_COUNT
+        return index * layer_size, (index + 1) * layer_size, position - index
+
+    def time(self, speed: float, heading_error: float, distance: float) -> float:
+        return self.time_in_layers(self.speed_layers(speed), heading_error, distance)
+
+    def time_in_layers(self, layers, heading_error: float, distance: float) -> float:
+        lower, upper, speed_weight = layers
+        heading = min(max(abs(heading_error) / self.HEADING_STEP, 0.0), self.HEADING_COUNT - 1.0)
+        h = min(int(heading), self.HEADING_COUNT - 2)
+        dh = heading - h
+        dist = min(max(distance / self.DISTANCE_STEP, 0.0), self.DISTANCE_COUNT - 1.0)
+        d = min(int(dist), self.DISTANCE_COUNT - 2)
+        dd = dist - d
+
+        times = self.times
+        row = h * self.DISTANCE_COUNT + d
+        next_row = row + self.DISTANCE_COUNT
+
+        def layer(offset: int) -> float:
+            near = times[offset + row] + (times[offset + row + 1] - times[offset + row]) * dd
+            far = times[offset + next_row] + (times[offset + next_row + 1] - times[offset + next_row]) * dd
+            return near + (far - near) * dh
+
+        low = layer(lower)
+        return low + (layer(upper) - low) * speed_weight
+
+
+TABLES = LazyTables({"turning": TurningTable})
+
+
+def turning_table() -> TurningTable:
+    """The turning table, loaded on first use."""
+    return TABLES.get("turning")  # type: ignore[no-any-return]
+
+
+def grid_columns() -> Dict[str, List[float]]:
+    """The TurningTable grid with the simulated turning time at every point."""
+    columns: Dict[str, List[float]] = {"speed": [], "heading_error": [], "distance": [], "time": []}
+    heading_errors = [h * TurningTable.HEADING_STEP for h in range(TurningTable.HEADING_COUNT)]
+    for s in range(TurningTable.SPEED_COUNT):
+        speed = s * TurningTable.SPEED_STEP
+        distances = [d * TurningTable.DISTANCE_STEP for d in range(TurningTable.DISTANCE_COUNT)]
+        times = [turning_times(speed, heading_errors, distance) for distance in distances]
+        for h, heading_error in enumerate(heading_errors):
+            for d, distance in enumerate(distances):
+                columns["speed"].append(speed)
+                columns["heading_error"].append(round(heading_error, 6))
+                columns["distance"].append(distance)
+                columns["time"].append(round(times[d][h], 5))
+    return columns
+
+
+def generate(path: Path):
+    columns = grid_columns()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(list(columns))
+        writer.writerows(zip(*columns.values()))
+
+
+if __name__ == "__main__":
+    generate(Path(__file__).absolute().parent / "turning" / "turning.csv")
@@ -6,7 +6,7 @@ from rlutilities.mechanics import Wavedash, Dodge
 from rlutilities.simulation import Car, Game
 from tools.arena import Arena
 from tools.drawing import DrawingTool
-from tools.intercept import estimate_time
+from tools.intercept import estimate_times
 from tools.vector_math import ground, distance, ground_distance, angle_to, direction
 
 
@@ -30,8 +30,8 @@ class Travel(Maneuver):
         self.driving = True
 
         # decide whether to start driving backwards and halfflip later
-        forward_estimate = estimate_time(car, self.target)
-        backwards_estimate = estimate_time(car, self.target, -1) + 0.5
+        forward_estimate, backwards_estimate = estimate_times(car, self.target)
+        backwards_estimate += 0.5
         backwards = (
                 dot(car.velocity, car.forward()) < 500
                 and backwards_estimate < forward_estimate
@@ -1,9 +1,10 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from maneuvers.strikes.strike import Strike
 from rlutilities.linear_algebra import vec3, norm, normalize, look_at, dot, xy
 from rlutilities.mechanics import Aerial
 from rlutilities.simulation import Car, Ball
+from tools.aerial_feasibility import minimum_miss_distance
 from tools.drawing import DrawingTool
 from tools.game_info import GameInfo
 from tools.intercept import Intercept
@@ -30,6 +31,7 @@ class AerialStrike(Strike):
         self.aerialing = False
         self.too_early = False
         self._flight_path: List[vec3] = []
+        self._same_time_position: Optional[vec3] = None
 
     def intercept_predicate(self, car: Car, ball: Ball):
         required_time = range_map(ball.position[2],
@@ -39,6 +41,9 @@ class AerialStrike(Strike):
                                   self.MAXIMAL_HEIGHT_TIME)
         return self.MINIMAL_HEIGHT < ball.position[2] < self.MAXIMAL_HEIGHT and ball.time - car.time > required_time
 
+    def intercept_height_range(self) -> Tuple[float, float]:
+        return self.MINIMAL_HEIGHT, self.MAXIMAL_HEIGHT
+
     def configure(self, intercept: Intercept):
         super().configure(intercept)
         self.aerial.target_position = intercept.position - direction(intercept, self.target) * 100
@@ -68,6 +73,21 @@ class AerialStrike(Strike):
 
         return test_car
 
+    def predicted_miss_distance(self, car: Car, flight_path: List[vec3] = None) -> float:
+        """How far from the target an aerial started by `car` right now would end up. When the target is
+        clearly out of reach, this is only a lower bound, and the flight is not simulated."""
+        aerial = self.aerial
+        time_left = aerial.arrival_time - car.time
+        relative_target = aerial.target_position - car.position
+        lower_bound = minimum_miss_distance(relative_target, car.velocity, time_left, aerial.double_jump)
+        if lower_bound > self.MAX_DISTANCE_ERROR:
+            if flight_path:
+                flight_path.clear()
+            return lower_bound
+
+        simulated_car = self.simulate_flight(car, aerial, flight_path)
+        return distance(simulated_car, aerial.target_position)
+
     def interruptible(self) -> bool:
         return self.aerialing or super().interruptible()
 
@@ -88,8 +108,10 @@ class AerialStrike(Strike):
 
             if time_left > 0.5:
                 self.info.predict_ball(3.0)
-                same_time_intercept = Intercept(self.car, self.info.ball_predictions, lambda car, ball: ball.time >= self.intercept.time, ignore_time_estimate=True)
-                self.intercept.ball.position = same_time_intercept.position  # just for rendering
+                same_time_ball = self.info.ball_at(self.intercept.time, interpolate=True)
+                same_time_intercept = Intercept(self.car, [same_time_ball] if same_time_ball else [], ignore_time_estimate=True)
+                # rendered separately, the intercept itself is shared with other strikes searching the same way
+                self._same_time_position = same_time_intercept.position
                 self.configure(same_time_intercept)
 
             self.aerial.target_orientation = look_at(to_ball, vec3(0, 0, -3) + to_ball)
@@ -102,7 +124,7 @@ class AerialStrike(Strike):
             super().step(dt)
 
             # simulate aerial from current state
-            simulated_car = self.simulate_flight(self.car, self.aerial, self._flight_path)
+            miss_distance = self.predicted_miss_distance(self.car, self._flight_path)
 
             speed_towards_target = dot(self.car.velocity, ground_direction(self.car, self.aerial.target_position))
             speed_needed = ground_distance(self.car, self.aerial.target_position) / safe_time_left
@@ -112,7 +134,7 @@ class AerialStrike(Strike):
                 self.controls.throttle = -1
 
             # if it ended up near the target, we could take off
-            elif distance(simulated_car, self.aerial.target_position) < self.MAX_DISTANCE_ERROR:
+            elif miss_distance < self.MAX_DISTANCE_ERROR:
                 if angle_to(self.car, self.aerial.target_position) < 0.1 or norm(self.car.velocity) < 1000:
 
                     if self.DELAY_TAKEOFF and ground_distance(self.car, self.aerial.target_position) > 1000:
@@ -130,11 +152,11 @@ class AerialStrike(Strike):
                         future_car.position += displacement
 
                         # simulate aerial fot the extrapolated car again
-                        future_simulated_car = self.simulate_flight(future_car, self.aerial)
+                        future_miss_distance = self.predicted_miss_distance(future_car)
 
                         # if the aerial is also successful, that means we should continue driving instead of taking off
                         # this makes sure that we go for the most late possible aerials, which are the most effective
-                        if distance(future_simulated_car, self.aerial.target_position) > self.MAX_DISTANCE_ERROR:
+                        if future_miss_distance > self.MAX_DISTANCE_ERROR:
                             self.aerialing = True
                         else:
                             self.too_early = True
@@ -149,6 +171,8 @@ class AerialStrike(Strike):
         super().render(draw)
         draw.color(draw.lime if self.aerialing else (draw.orange if self.too_early else draw.red))
         draw.polyline(self._flight_path)
+        if self._same_time_position is not None:
+            draw.point(self._same_time_position)
 
 
 class FastAerialStrike(AerialStrike):
@@ -1,3 +1,6 @@
+import math
+from typing import Tuple
+
 from maneuvers.strikes.dodge_strike import DodgeStrike
 from rlutilities.simulation import Car, Ball
 from tools.intercept import Intercept
@@ -15,6 +18,9 @@ class CloseShot(DodgeStrike):
         # lower max height than DodgeStrike, because high jumps usually result in hitting the crossbar
         return super().intercept_predicate(car, ball) and ball.position[2] < 250
 
+    def intercept_height_range(self) -> Tuple[float, float]:
+        return -math.inf, min(250, self.info.object_ground_cutoff)
+
     def configure(self, intercept: Intercept):
         self.target[0] = abs_clamp(self.intercept.ground_pos[0], 300)
         super().configure(intercept)
@@ -1,9 +1,12 @@
+import math
+from typing import Tuple
+
+from data.jump_table import jump_table
 from maneuvers.jumps.aim_dodge import AimDodge
 from maneuvers.strikes.strike import Strike
 from rlutilities.linear_algebra import cross, norm, dot, normalize, vec3
 from rlutilities.simulation import Car, Ball
 from tools.intercept import Intercept
-from tools.math import clamp
 from tools.vector_math import ground_direction
 
 
@@ -20,6 +23,9 @@ class DodgeStrike(Strike):
             return False
         return ball.position[2] < self.info.object_ground_cutoff
 
+    def intercept_height_range(self) -> Tuple[float, float]:
+        return -math.inf, self.info.object_ground_cutoff
+
     def __init__(self, car: Car, info, target=None):
         self.dodge = AimDodge(car, 0.1, info.ball.position)
         self.dodging = False
@@ -28,7 +34,7 @@ class DodgeStrike(Strike):
 
     def get_jump_duration(self, ball_height: float) -> float:
         base_height = self.info.object_rest_height
-        return 0.05 + clamp((ball_height - base_height) / 500, 0, 1.5) + self.additional_jump_time
+        return 0.05 + jump_table().time_to_height(max(ball_height - base_height, 0.0)) + self.additional_jump_time
 
     def configure(self, intercept: Intercept):
         super().configure(intercept)
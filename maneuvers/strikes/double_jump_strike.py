@@ -1,5 +1,6 @@
-from typing import Optional
+from typing import Optional, Tuple
 
+from data.jump_table import jump_table
 from maneuvers.driving.drive import Drive
 from maneuvers.strikes.strike import Strike
 from rlutilities.linear_algebra import vec3, dot, normalize, look_at, norm
@@ -12,6 +13,8 @@ from tools.vector_math import ground_distance, ground, ground_direction, directi
 MIN_ALIGNMENT = 0.9
 MIN_DIST_BEFORE_SPEED_CONTROL = 1500
 JUMP_FALSE_TICKS = 2
+FIRST_JUMP_DURATION = 0.2
+SECOND_JUMP_DELAY = (JUMP_FALSE_TICKS + 1) / 120  # the second jump comes on the tick after the false ticks
 ALLOWED_TIME_ERROR = 0.1
 
 
@@ -20,6 +23,9 @@ class DoubleJumpStrike(Strike):
     def intercept_predicate(self, car: Car, ball: Ball):
         return 250 < ball.position[2] < 550
 
+    def intercept_height_range(self) -> Tuple[float, float]:
+        return 250, 550
+
     def __init__(self, car: Car, info: GameInfo, target: Optional[vec3] = None):
         self.drive = Drive(car)
         self.reorient = Reorient(car)
@@ -42,10 +48,10 @@ class DoubleJumpStrike(Strike):
         if self.jumping:
             self.controls = Input()
             # first jump for full 0.2 sec
-            if self.timer <= 0.2:
+            if self.timer <= FIRST_JUMP_DURATION:
                 self.controls.jump = True
             # single tick between jumps
-            elif self.timer <= 0.2 + dt * JUMP_FALSE_TICKS:
+            elif self.timer <= FIRST_JUMP_DURATION + dt * JUMP_FALSE_TICKS:
                 self.controls.jump = False
             # second jump
             else:
@@ -97,9 +103,5 @@ class DoubleJumpStrike(Strike):
     @staticmethod
     def double_jump_time_needed(height):
         """Return the time needed for the double jump to reach a given height"""
-        # polynomial approximation
-        a = 1.872348977E-8 * height * height * height
-        b = -1.126747937E-5 * height * height
-        c = 3.560647225E-3 * height
-        d = -7.446058499E-3
-        return a + b + c + d
+        return jump_table().time_to_height(height, first_hold_duration=FIRST_JUMP_DURATION,
+                                           second_jump_delay=SECOND_JUMP_DELAY)
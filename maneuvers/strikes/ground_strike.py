@@ -1,3 +1,6 @@
+import math
+from typing import Tuple
+
 from maneuvers.strikes.strike import Strike
 from rlutilities.linear_algebra import dot, norm
 from rlutilities.simulation import Field, sphere, Car, Ball
@@ -22,6 +25,9 @@ class GroundStrike(Strike):
         contact_ray = Field.collide(sphere(ball.position, self.max_distance_from_wall))
         return norm(contact_ray.start) > 0 and abs(dot(ball.velocity, contact_ray.direction)) < 300
 
+    def intercept_height_range(self) -> Tuple[float, float]:
+        return -math.inf, min(200, self.info.object_ground_cutoff)
+
     def configure(self, intercept: Intercept):
         target_direction = ground_direction(intercept, self.target)
         strike_direction = ground_direction(intercept.ball.velocity, target_direction * 4000)
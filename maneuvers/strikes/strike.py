@@ -1,5 +1,5 @@
 import math
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from maneuvers.driving.arrive import Arrive
 from maneuvers.maneuver import Maneuver
@@ -36,6 +36,10 @@ class Strike(Maneuver):
     def intercept_predicate(self, car: Car, ball: Ball) -> bool:
         return True
 
+    def intercept_height_range(self) -> Optional[Tuple[float, float]]:
+        """Inclusive height band outside of which intercept_predicate never holds, if there is one."""
+        return None
+
     def configure(self, intercept: Intercept):
         self.arrive.target = intercept.ground_pos
         self.arrive.arrival_time = intercept.time
@@ -43,16 +47,19 @@ class Strike(Maneuver):
         self.arrive.asap = not intercept.predicate_later_than_time
 
     def update_intercept(self):
-        self.intercept = Intercept(self.car, self.info.ball_predictions, self.intercept_predicate)
-
+        height_range = self.intercept_height_range()
         if self.allow_backwards:
-            backwards_intercept = Intercept(self.car, self.info.ball_predictions, self.intercept_predicate,
-                                            backwards=True)
+            self.intercept, backwards_intercept = self.info.intercepts_both_ways(
+                self.car, self.intercept_predicate, height_range=height_range, bisect=True, interpolate=True
+            )
             if backwards_intercept.time + 0.1 < self.intercept.time:
                 self.intercept = backwards_intercept
                 self._should_strike_backwards = True
             else:
                 self._should_strike_backwards = False
+        else:
+            self.intercept = self.info.intercept(self.car, self.intercept_predicate, height_range=height_range,
+                                                 bisect=True, interpolate=True)
 
         self.configure(self.intercept)
         self._last_update_time = self.car.time
@@ -96,7 +103,7 @@ class Strike(Maneuver):
 
         if not self._has_drawn_prediction:
             self._has_drawn_prediction = True
-            draw.ball_prediction(self.info.ball_predictions, self.intercept.time)
+            draw.ball_prediction(self.info.ball_window(self.info.time, self.intercept.time))
 
     def pick_easiest_target(self, car: Car, ball: Ball, targets: List[vec3]) -> vec3:
         to_goal = ground_direction(ball, self.info.their_goal.center)
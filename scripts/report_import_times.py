@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""Report how long importing Botimus modules takes, using `python -X importtime` in a fresh process."""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).absolute().parent.parent
+DEFAULT_MODULES = ["data.acceleration_lut", "data.arrival_table", "tools.intercept", "harness.runner", "agent"]
+
+
+def parse_import_times(stderr: str) -> list[tuple[str, int, int]]:
+    """(module, self microseconds, cumulative microseconds) for each import line of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, module = line[len("import time:"):].split("|", 2)
+        rows.append((module.rstrip(), int(own), int(cumulative)))
+    return rows
+
+
+def measure(module: str) -> tuple[list[tuple[str, int, int]], str | None]:
+    """Import times of `module` and everything it imports, and the error if the import failed."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    error = None
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit code {result.returncode}"
+    return parse_import_times(result.stderr), error
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Report Botimus module import times")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="modules to import")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list per module")
+    return parser
+
+
+def main() -> int:
+    args = _build_arg_parser().parse_args()
+    for module in args.modules:
+        rows, error = measure(module)
+        if error is not None:
+            print(f"{module}: failed ({error})")
+            continue
+        total = next((cumulative for name, _, cumulative in rows if name.strip() == module), 0)
+        print(f"{module}: {total / 1000:.1f} ms")
+        for name, own, _ in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+            print(f"  {own / 1000:8.1f} ms  {name.strip()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,7 +2,7 @@ from typing import Optional, Set
 
 from rlutilities.simulation import Car, BoostPad, BoostPadState
 from tools.game_info import GameInfo
-from tools.intercept import estimate_time
+from tools.intercept import ArrivalEstimator
 from tools.vector_math import distance
 
 
@@ -16,7 +16,11 @@ def choose_boostpad_to_pickup(
 
     # consider pads which are available or going to spawn before we can reach them
     active_pads = {pad for pad in info.large_boost_pads if pad.state == BoostPadState.Available}
-    soon_active_pads = {pad for pad in info.large_boost_pads if estimate_time(car, pad.position) * 0.7 > pad.timer}
+    time_to = ArrivalEstimator(car).time_to
+    soon_active_pads = {
+        pad for pad in info.large_boost_pads
+        if time_to(pad.position[0], pad.position[1], pad.position[2]) * 0.7 > pad.timer
+    }
 
     valid_pads = active_pads | soon_active_pads - forbidden_pads
     if not valid_pads:
@@ -8,7 +8,6 @@ from strategy import offense, defense, kickoffs
 from strategy.boost_management import choose_boostpad_to_pickup, compute_low_boost_threshold
 from tools.decision_memory import DecisionMemory
 from tools.game_info import GameInfo
-from tools.intercept import Intercept
 from tools.vector_math import align, ground, ground_distance, ground_direction
 
 
@@ -38,8 +37,8 @@ def choose_maneuver(
 
     info.predict_ball()
 
-    my_intercept = Intercept(my_car, info.ball_predictions)
-    their_intercepts = [Intercept(opponent, info.ball_predictions) for opponent in opponents]
+    my_intercept = info.intercept(my_car)
+    their_intercepts = [info.intercept(opponent) for opponent in opponents]
     their_intercept = min(their_intercepts, key=lambda i: i.time)
     opponent = their_intercept.car
 
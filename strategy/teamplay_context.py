@@ -45,12 +45,12 @@ def build_context(info: GameInfo, team_cars: List[Car]) -> TeamplayContext:
 
     info.predict_ball()
 
-    intercepts_by_id = {car.id: Intercept(car, info.ball_predictions) for car in team_cars}
+    intercepts_by_id = {car.id: info.intercept(car) for car in team_cars}
 
     opponent_fastest = None
     opponents = info.get_opponents()
     if opponents:
-        opponent_intercepts = [Intercept(opponent, info.ball_predictions) for opponent in opponents]
+        opponent_intercepts = [info.intercept(opponent) for opponent in opponents]
         opponent_fastest = min(opponent_intercepts, key=lambda intercept: intercept.time)
 
     def attacker_score(car: Car) -> float:
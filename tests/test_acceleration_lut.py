@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from data.acceleration_lut import BOOST, THROTTLE
+
+
+def test_interpolated_simulation_matches_table_rows() -> None:
+    row = 100
+    result = THROTTLE.simulate_until_limit(THROTTLE.speeds[10], distance_limit=THROTTLE.distances[row] - THROTTLE.distances[10])
+    assert result.speed_reached == pytest.approx(THROTTLE.speeds[row])
+    assert result.time_passed == pytest.approx(THROTTLE.times[row] - THROTTLE.times[10])
+    assert result.distance_limit_reached
+
+
+def test_interpolated_simulation_is_continuous_between_rows() -> None:
+    distances = [d / 4 for d in range(1, 2000)]
+    times = [BOOST.simulate_until_limit(500.0, distance_limit=d).time_passed for d in distances]
+    assert all(b >= a for a, b in zip(times, times[1:]))
+    assert max(b - a for a, b in zip(times, times[1:])) < 0.002
+
+    snapped = BOOST.simulate_until_limit(500.0, distance_limit=250.0, interpolate=False)
+    interpolated = BOOST.simulate_until_limit(500.0, distance_limit=250.0)
+    assert interpolated.distance_traveled == pytest.approx(250.0)
+    assert abs(interpolated.time_passed - snapped.time_passed) < 0.01
+
+
+def test_limits_past_the_table_end_are_not_reached() -> None:
+    result = THROTTLE.simulate_until_limit(0.0, time_limit=100.0)
+    assert result.speed_reached == THROTTLE.speeds[-1]
+    assert not result.time_limit_reached
+
+
+def test_batch_matches_single_queries() -> None:
+    rng = random.Random(5)
+    speeds = [rng.uniform(0.0, 2000.0) for _ in range(50)]
+    distances = [rng.uniform(1.0, 3000.0) for _ in range(50)]
+    times = [rng.uniform(0.01, 3.0) for _ in range(50)]
+    batch = BOOST.simulate_until_limit_batch(speeds, time_limits=times, distance_limits=distances)
+    for i, speed in enumerate(speeds):
+        single = BOOST.simulate_until_limit(speed, time_limit=times[i], distance_limit=distances[i])
+        assert batch.speeds_reached[i] == single.speed_reached
+        assert batch.times_passed[i] == single.time_passed
+        assert batch.distances_traveled[i] == single.distance_traveled
+        assert batch.speed_limits_reached[i] == single.speed_limit_reached
+        assert batch.time_limits_reached[i] == single.time_limit_reached
+        assert batch.distance_limits_reached[i] == single.distance_limit_reached
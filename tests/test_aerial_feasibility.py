@@ -0,0 +1,14 @@
+from tools.aerial_feasibility import minimum_miss_distance
+
+
+def test_miss_distance_bound_rules_out_only_unreachable_targets() -> None:
+    # a target 300 uu above a resting car is reachable in a second
+    assert minimum_miss_distance((0.0, 0.0, 300.0), (0.0, 0.0, 0.0), 1.0, False) == 0.0
+    # but not 3000 uu away in half a second
+    assert minimum_miss_distance((3000.0, 0.0, 500.0), (0.0, 0.0, 0.0), 0.5, False) > 2000.0
+    # unless the car is already flying there
+    assert minimum_miss_distance((3000.0, 0.0, 500.0), (6000.0, 0.0, 800.0), 0.5, False) == 0.0
+    # a double jump reaches further, and no time left leaves the whole distance
+    assert (minimum_miss_distance((0.0, 0.0, 1500.0), (0.0, 0.0, 0.0), 1.2, True)
+            < minimum_miss_distance((0.0, 0.0, 1500.0), (0.0, 0.0, 0.0), 1.2, False))
+    assert minimum_miss_distance((300.0, 400.0, 0.0), (0.0, 0.0, 0.0), -0.1, False) == 500.0
@@ -0,0 +1,61 @@
+import random
+from typing import Optional
+
+from data.acceleration_lut import BOOST, THROTTLE, AccelerationLUT
+from data.arrival_table import arrival_table, drive_time, drive_times
+
+
+def _chained_drive_time(speed: float, boost: float, dist: float) -> float:
+    # the boost, throttle and cruise phases as single lookups, the way estimate_time chained them
+    time = 0.0
+    result: Optional[AccelerationLUT.LookupResult] = None
+    if boost > 0:
+        result = BOOST.simulate_until_limit(speed, distance_limit=dist, time_limit=boost / 33.33)
+        dist -= result.distance_traveled
+        time += result.time_passed
+        speed = result.speed_reached
+
+    if dist > 0 and speed < 1410:
+        result = THROTTLE.simulate_until_limit(speed, distance_limit=dist)
+        dist -= result.distance_traveled
+        time += result.time_passed
+        speed = result.speed_reached
+
+    if result is None or not result.distance_limit_reached:
+        time += dist / max(speed, 1.0)
+    return time
+
+
+def test_drive_time_matches_chained_lookups() -> None:
+    rng = random.Random(3)
+    for _ in range(500):
+        speed = rng.uniform(1.0, 2300.0)
+        boost = rng.choice([0.0, rng.uniform(0.0, 100.0)])
+        dist = rng.uniform(1.0, 12000.0)
+        assert abs(drive_time(speed, boost, dist) - _chained_drive_time(speed, boost, dist)) < 1e-9
+
+
+def test_batched_drive_times_match_single_ones() -> None:
+    distances = [0.0, 1.0, 50.0, 400.0, 2500.0, 9000.0]
+    for speed, boost in ((1.0, 0.0), (800.0, 12.0), (1500.0, 100.0), (2300.0, 40.0)):
+        times = drive_times(speed, boost, distances)
+        assert list(times) == [drive_time(speed, boost, dist) for dist in distances]
+    assert drive_times(1000.0, 50.0, [0.0])[0] == 0.0
+
+
+def test_arrival_table_interpolates_chained_lookups() -> None:
+    table = arrival_table()
+    rng = random.Random(7)
+    for _ in range(4000):
+        # half of the drives start slowly and are short, where the time is furthest from linear
+        speed = rng.uniform(1.0, 2300.0) if rng.random() < 0.5 else rng.uniform(1.0, 150.0)
+        boost = rng.choice([0.0, rng.uniform(0.0, 100.0)])
+        dist = rng.uniform(0.0, 15000.0) if rng.random() < 0.5 else rng.uniform(0.0, 500.0)
+        expected = _chained_drive_time(speed, boost, dist) if dist > 0 else 0.0
+        assert abs(table.curve(speed, boost).time(dist) - expected) < 0.03 + 0.02 * expected, (speed, boost, dist)
+
+
+def test_arrival_table_is_exact_on_grid_points() -> None:
+    curve = arrival_table().curve(1000.0, 50.0)
+    for dist in (100.0, 2500.0, 12800.0):
+        assert abs(curve.time(dist) - drive_time(1000.0, 50.0, dist)) < 1e-9
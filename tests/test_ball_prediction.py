@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import pytest
+
+from tools.ball_prediction import (
+    BallPrediction, TrajectoryCache, first_crossing_time, refine_ball_slices, reusable_slice_count,
+    simulate_ball_slices,
+)
+
+
+def _filled(count: int, capacity: int = 4) -> BallPrediction:
+    prediction = BallPrediction(capacity=capacity)
+    for i in range(count):
+        prediction.append(i * 0.5, (i, 2.0 * i, 100.0), (10.0, 0.0, -i), (0.0, 0.0, 1.0))
+    return prediction
+
+
+def test_append_grows_past_capacity_and_exposes_views() -> None:
+    prediction = _filled(10)
+    assert len(prediction) == 10
+    assert prediction.capacity >= 10
+    assert prediction[3].time == 1.5
+    assert prediction[3].position == (3.0, 6.0, 100.0)
+    assert prediction[-1].velocity == (10.0, 0.0, -9.0)
+    assert [ball.time for ball in prediction[:2]] == [0.0, 0.5]
+    with pytest.raises(IndexError):
+        prediction[10]
+
+
+def test_drop_front_shifts_remaining_slices() -> None:
+    prediction = _filled(6)
+    prediction.drop_front(4)
+    assert len(prediction) == 2
+    assert [ball.time for ball in prediction] == [2.0, 2.5]
+    assert prediction[0].position == (4.0, 8.0, 100.0)
+
+
+def test_clear_reuses_storage() -> None:
+    prediction = _filled(6)
+    capacity = prediction.capacity
+    prediction.clear()
+    assert not prediction
+    prediction.append(1.0, (0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+    assert len(prediction) == 1
+    assert prediction.capacity == capacity
+
+
+def test_time_lookup_uses_slice_spacing() -> None:
+    prediction = _filled(10)
+    prediction.dt = 0.5
+    assert prediction.count_before(-1.0) == 0
+    assert prediction.count_before(1.5) == 3
+    assert prediction.count_before(1.6) == 4
+    assert prediction.count_before(99.0) == 10
+    assert prediction.slice_at(1.6).time == 2.0
+    assert prediction.slice_at(99.0).time == 4.5
+    assert [ball.time for ball in prediction.window(1.0, 2.5)] == [1.0, 1.5, 2.0]
+
+
+def test_time_lookup_tolerates_uneven_spacing() -> None:
+    prediction = BallPrediction()
+    for time in [0.0, 0.1, 0.25, 0.3, 0.5]:
+        prediction.append(time, (0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+    prediction.dt = 0.1
+    assert prediction.count_before(0.26) == 3
+    assert prediction.count_before(0.45) == 4
+
+
+def test_slice_at_interpolates_between_slices() -> None:
+    prediction = _filled(4)
+    prediction.dt = 0.5
+    state = prediction.slice_at(0.75, interpolate=True)
+    assert state.time == 0.75
+    assert state.position == (1.5, 3.0, 100.0)
+    assert state.velocity == (10.0, 0.0, -1.5)
+
+
+class _Extender:
+    def __init__(self, prediction: BallPrediction):
+        self.prediction = prediction
+        self.calls = 0
+
+    def __call__(self, count: int) -> None:
+        self.calls += 1
+        while self.prediction.count < count:
+            i = self.prediction.count
+            self.prediction.append(i * 0.5, (i, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+
+
+def test_lazy_prediction_extends_on_demand() -> None:
+    prediction = BallPrediction()
+    prediction.dt = 0.5
+    extender = _Extender(prediction)
+    prediction.extend_lazily(100, extender)
+    assert len(prediction) == 100
+    assert prediction.count == 0
+
+    assert prediction[3].time == 1.5
+    assert prediction.count == BallPrediction.EXTEND_CHUNK
+
+    assert prediction.slice_at(10.0).time == 10.0
+    assert 21 <= prediction.count < 100
+
+    prediction.extend_lazily(120, extender)
+    assert prediction[-1].time == 59.5
+    assert prediction.count == len(prediction) == 120
+
+
+def test_slice_at_on_fresh_lazy_prediction() -> None:
+    prediction = BallPrediction()
+    prediction.dt = 0.5
+    prediction.extend_lazily(100, _Extender(prediction))
+    assert prediction.slice_at(0.0).time == 0.0
+
+    prediction.clear()
+    prediction.extend_lazily(100, _Extender(prediction))
+    state = prediction.slice_at(2.25, interpolate=True)
+    assert state.time == 2.25
+    assert state.position == (4.5, 0.0, 0.0)
+    assert prediction.slice_at(1000.0).time == 49.5
+
+    prediction.clear()
+    with pytest.raises(IndexError):
+        prediction.slice_at(1.0)
+
+
+def test_lazy_prediction_iteration_stops_early() -> None:
+    prediction = BallPrediction()
+    prediction.extend_lazily(1000, _Extender(prediction))
+    for ball in prediction:
+        if ball.time >= 2.0:
+            break
+    assert prediction.count < 1000
+
+
+def test_first_crossing_time_interpolates_plane_crossing() -> None:
+    times = [0.1, 0.2, 0.3]
+    ys = [5000.0, 5100.0, 5200.0]
+    crossing = first_crossing_time(times, ys, 3, 5120.0, False, 0.0, 4900.0)
+    assert crossing is not None
+    assert abs(crossing - 0.22) < 1e-9
+    assert first_crossing_time(times, ys, 2, 5120.0, False, 0.0, 4900.0) is None
+
+
+def test_first_crossing_time_below_limit_on_prediction_columns() -> None:
+    prediction = BallPrediction()
+    for i in range(5):
+        prediction.append(i * 0.25, (0.0, -5000.0 - 100.0 * i, 93.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+    crossing = first_crossing_time(prediction.time, prediction.position_y, prediction.count, -5120.0, True, -0.25, -4900.0)
+    assert crossing is not None
+    assert abs(crossing - 0.3) < 1e-9
+    assert first_crossing_time(prediction.time, prediction.position_y, 2, -5120.0, True, 0.0, -4900.0) is None
+
+
+def test_fill_towards_keeps_slices_uniform() -> None:
+    prediction = _filled(1)
+    prediction.fill_towards(2.0, (40.0, 0.0, 100.0), (10.0, 0.0, -4.0), (0.0, 0.0, 1.0), 4)
+    assert [ball.time for ball in prediction] == [0.0, 0.5, 1.0, 1.5, 2.0]
+    assert prediction[2].position == (20.0, 0.0, 100.0)
+    assert prediction[-1].velocity == (10.0, 0.0, -4.0)
+
+
+def test_trajectory_cache_rebases_and_evicts_least_recently_used() -> None:
+    cache = TrajectoryCache(size=2)
+    cache.store("a", _filled(6), start_time=-0.5, coarse_from=1.0)
+    cache.store("b", _filled(2), start_time=0.0)
+
+    restored = BallPrediction()
+    assert cache.restore("a", restored, start_time=10.0, max_count=4) == 11.5
+    assert [ball.time for ball in restored] == [10.5, 11.0, 11.5, 12.0]
+    assert restored[1].position == (1.0, 2.0, 100.0)
+
+    cache.store("c", _filled(1), start_time=0.0)
+    assert cache.restore("b", restored, start_time=0.0, max_count=10) is None
+    assert cache.restore("a", restored, start_time=0.0, max_count=10) is not None
+    assert len(restored) == 6
+    assert (cache.hits, cache.misses, len(cache)) == (2, 1, 2)
+
+
+def test_height_spans_cover_runs_and_refresh_when_slices_change() -> None:
+    prediction = BallPrediction()
+    for i, height in enumerate([100.0, 300.0, 400.0, 700.0, 500.0, 250.0, 90.0]):
+        prediction.append(i * 0.1, (0.0, 0.0, height), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+
+    assert list(prediction.height_spans(250.0, 550.0)) == [(1, 3), (4, 6)]
+    assert list(prediction.height_spans(-1e9, 95.0)) == [(6, 7)]
+
+    prediction.drop_front(4)
+    assert list(prediction.height_spans(250.0, 550.0)) == [(0, 2)]
+    prediction.append(1.0, (0.0, 0.0, 260.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+    assert list(prediction.height_spans(250.0, 550.0)) == [(0, 2), (3, 4)]
+
+
+def test_height_spans_only_simulate_the_slices_asked_for() -> None:
+    prediction = BallPrediction()
+    prediction.dt = 0.5
+    prediction.extend_lazily(100, _Extender(prediction))  # slice i is i uu along x, on the ground
+
+    spans = prediction.height_spans(-1.0, 1.0)
+    assert next(spans) == (0, BallPrediction.EXTEND_CHUNK)
+    assert prediction.count == BallPrediction.EXTEND_CHUNK
+    assert next(spans) == (0, 2 * BallPrediction.EXTEND_CHUNK)
+    assert prediction.count == 2 * BallPrediction.EXTEND_CHUNK
+
+    # the scan is shared, and the whole run comes last once every slice is simulated
+    assert list(prediction.height_spans(-1.0, 1.0))[-1] == (0, 100)
+    assert list(prediction.height_spans(5.0, 10.0)) == []
+
+class _FallingBall:
+    """Ball stepped with semi-implicit Euler, so a coarse step lands somewhere else than fine ones."""
+
+    def __init__(self, time: float = 0.0, height: float = 1000.0):
+        self.time = time
+        self.position = (0.0, 0.0, height)
+        self.velocity = (100.0, 0.0, 0.0)
+        self.angular_velocity = (0.0, 0.0, 0.0)
+        self.steps = 0
+
+    def step(self, dt: float) -> None:
+        self.steps += 1
+        self.time += dt
+        vz = self.velocity[2] - 650.0 * dt
+        self.velocity = (self.velocity[0], 0.0, vz)
+        self.position = (self.position[0] + self.velocity[0] * dt, 0.0, self.position[2] + vz * dt)
+
+
+def test_simulate_ball_slices_steps_coarsely_past_the_fine_horizon() -> None:
+    dt = 0.125
+    prediction = BallPrediction()
+    cursor = _FallingBall()
+    coarse_from = simulate_ball_slices(prediction, cursor, 12, dt, 4, fine_until=0.5)
+    assert [ball.time for ball in prediction] == [dt * (i + 1) for i in range(12)]
+    assert coarse_from == 0.5
+    assert cursor.steps == 4 + 2
+
+
+def test_refining_a_reused_prediction_only_resimulates_slices_entering_the_fine_horizon() -> None:
+    dt = 0.125
+    prediction = BallPrediction()
+    coarse_from = simulate_ball_slices(prediction, _FallingBall(), 12, dt, 4, fine_until=0.5)
+    fine = BallPrediction()
+    simulate_ball_slices(fine, _FallingBall(), 12, dt, 1, fine_until=0.5)
+
+    # a tick later, the fine horizon has moved on by one slice
+    prediction.drop_front(1)
+    tail = [list(column[4:11]) for column in prediction.columns]
+    index = 3  # slices up to coarse_from, which is prediction.time[2]
+    assert prediction.time[index - 1] == coarse_from
+    cursor = _FallingBall()
+    cursor.time, cursor.position, cursor.velocity = 0.5, fine[3].position, fine[3].velocity
+    refined = refine_ball_slices(prediction, cursor, index, dt, fine_until=0.5 + dt)
+
+    assert refined == index + 1 and cursor.steps == 1
+    assert prediction[index].position == fine[index + 1].position
+    assert [list(column[4:11]) for column in prediction.columns] == tail
+
+
+def _ball_at(prediction: BallPrediction, index: int) -> _FallingBall:
+    ball = _FallingBall()
+    ball.time, ball.position = prediction[index].time, prediction[index].position
+    ball.velocity, ball.angular_velocity = prediction[index].velocity, prediction[index].angular_velocity
+    return ball
+
+
+def test_advancing_one_tick_reuses_the_prediction_with_one_step() -> None:
+    dt = 1 / 120
+    prediction = BallPrediction()
+    cursor = _FallingBall()
+    simulate_ball_slices(prediction, cursor, 600, dt, 1, fine_until=1.5)
+    assert cursor.steps == 600
+
+    ball = _ball_at(prediction, 0)
+    reused = reusable_slice_count(prediction, dt, 3.0, ball, ball.time, dt, 3.0)
+    assert reused == 1
+    prediction.drop_front(reused)
+    simulate_ball_slices(prediction, cursor, 600, dt, 1, fine_until=1.5 + dt)
+    assert cursor.steps == 601
+    assert prediction.count == 600 and prediction.time[0] == ball.time + dt
+
+
+def test_touch_or_diverging_ball_forces_a_full_prediction() -> None:
+    dt = 1 / 120
+    prediction = BallPrediction()
+    simulate_ball_slices(prediction, _FallingBall(), 600, dt, 1, fine_until=1.5)
+    ball = _ball_at(prediction, 2)
+    assert reusable_slice_count(prediction, dt, 3.0, ball, ball.time, dt, 3.0) == 3
+
+    # touched since the prediction was made, or predicted with another step
+    assert reusable_slice_count(prediction, dt, 3.0, ball, ball.time, dt, 3.5) == 0
+    assert reusable_slice_count(prediction, dt / 2, 3.0, ball, ball.time, dt, 3.0) == 0
+
+    # the ball ended up somewhere else than predicted
+    ball.position = (ball.position[0] + 10.0, ball.position[1], ball.position[2])
+    assert reusable_slice_count(prediction, dt, 3.0, ball, ball.time, dt, 3.0) == 0
+    ball = _ball_at(prediction, 2)
+    ball.velocity = (ball.velocity[0], ball.velocity[1], ball.velocity[2] + 50.0)
+    assert reusable_slice_count(prediction, dt, 3.0, ball, ball.time, dt, 3.0) == 0
+
+    # or the prediction no longer covers the current time
+    ball = _ball_at(prediction, 599)
+    assert reusable_slice_count(prediction, dt, 3.0, ball, ball.time, dt, 3.0) == 0
+    assert reusable_slice_count(prediction, dt, 3.0, ball, 100.0, dt, 3.0) == 0
+
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import ctypes
+
+from tools.adapters.ball_prediction_struct import BallPredictionStructView, is_ball_prediction_struct
+from tools.ball_prediction import BallPrediction
+
+
+# same layout as rlbot.utils.structures.ball_prediction_struct
+class Vector3(ctypes.Structure):
+    _fields_ = [("x", ctypes.c_float), ("y", ctypes.c_float), ("z", ctypes.c_float)]
+
+
+class Rotator(ctypes.Structure):
+    _fields_ = [("pitch", ctypes.c_float), ("yaw", ctypes.c_float), ("roll", ctypes.c_float)]
+
+
+class Physics(ctypes.Structure):
+    _fields_ = [
+        ("location", Vector3),
+        ("rotation", Rotator),
+        ("velocity", Vector3),
+        ("angular_velocity", Vector3),
+    ]
+
+
+class Slice(ctypes.Structure):
+    _fields_ = [("physics", Physics), ("game_seconds", ctypes.c_float)]
+
+
+class StructBallPrediction(ctypes.Structure):
+    _fields_ = [("slices", Slice * 360), ("num_slices", ctypes.c_int)]
+
+
+def _make_prediction(num_slices: int) -> StructBallPrediction:
+    prediction = StructBallPrediction()
+    prediction.num_slices = num_slices
+    for i in range(num_slices):
+        physics = prediction.slices[i].physics
+        prediction.slices[i].game_seconds = 10.0 + i / 60
+        physics.location.x, physics.location.y, physics.location.z = i, -i, 100.0
+        physics.rotation.yaw = 99.0
+        physics.velocity.x, physics.velocity.y, physics.velocity.z = 2.0 * i, 0.0, -1.0
+        physics.angular_velocity.z = 0.5
+    return prediction
+
+
+def test_struct_detection() -> None:
+    assert is_ball_prediction_struct(_make_prediction(1))
+    assert not is_ball_prediction_struct(Vector3())
+    assert not is_ball_prediction_struct(object())
+
+
+def test_struct_view_reads_physics_columns() -> None:
+    view = BallPredictionStructView(_make_prediction(120))
+    assert view.num_slices == 120
+    assert len(view.time) == 120
+    x, y, z, vx, vy, vz, wx, wy, wz = view.vectors
+    assert list(x[:3]) == [0.0, 1.0, 2.0]
+    assert list(y[:3]) == [0.0, -1.0, -2.0]
+    assert vx[5] == 10.0 and vz[5] == -1.0
+    assert wz[7] == 0.5
+
+
+def test_struct_view_select_filters_time_and_steps() -> None:
+    view = BallPredictionStructView(_make_prediction(120))
+    columns = view.select(10.0 + 1e-4, 11.0, step=2)
+    times = list(columns[0])
+    assert times[0] == ctypes.c_float(10.0 + 2 / 60).value
+    assert len(times) == 30
+    assert list(columns[1][:2]) == [2.0, 4.0]
+
+    prediction = BallPrediction()
+    prediction.assign(columns)
+    assert len(prediction) == 30
+    assert prediction[1].position == (4.0, -4.0, 100.0)
+    assert prediction[1].velocity == (8.0, 0.0, -1.0)
@@ -79,5 +79,22 @@ preset = platinum
 def test_default_settings_shape() -> None:
     settings = default_settings()
     assert settings.object_mode.mode == "auto"
+    assert settings.object_mode.incremental_ball_prediction is True
     assert 0 <= settings.skill.overall <= 1
     assert 0 <= settings.skill.mechanics <= 1
+
+
+def test_prediction_resolution_settings(tmp_path: Path) -> None:
+    config_path = tmp_path / "settings.ini"
+    config_path.write_text(
+        """
+[Object]
+prediction_fine_horizon = 1.0
+prediction_coarse_rate = 500
+        """.strip(),
+        encoding="utf-8",
+    )
+
+    settings = load_bot_settings(config_path)
+    assert abs(settings.object_mode.prediction_fine_horizon - 1.0) < 1e-9
+    assert abs(settings.object_mode.prediction_coarse_rate - 120.0) < 1e-9
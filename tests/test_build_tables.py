@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from data.acceleration_lut import BOOST, THROTTLE, AccelerationLUT
+from data.build_tables import build, main
+from data.lookup_table import read_table
+
+
+def test_built_acceleration_tables_agree_with_captured_ones(tmp_path: Path) -> None:
+    build(tmp_path, ["boost", "throttle"], dt=1 / 120, duration=3.0)
+    for name, captured in (("boost", BOOST), ("throttle", THROTTLE)):
+        generated = AccelerationLUT(str(tmp_path / f"{name}.blut"))
+        for time in (0.25, 0.75, 1.5):
+            expected = captured.simulate_until_limit(0.0, time_limit=time)
+            result = generated.simulate_until_limit(0.0, time_limit=time)
+            assert abs(result.speed_reached - expected.speed_reached) < 0.05 * expected.speed_reached
+            assert abs(result.distance_traveled - expected.distance_traveled) < 0.05 * expected.distance_traveled
+
+
+def test_tables_keep_their_resolution_and_precision(tmp_path: Path) -> None:
+    assert main(["coast", "brake", "--dt", "0.01", "--float32", "--output", str(tmp_path)]) == 0
+    metadata, columns = read_table(tmp_path / "brake.blut")
+    assert metadata["dt"] == 0.01
+    assert abs(columns["time"][1] - 0.01) < 1e-6
+    assert columns["car_vel_x"][0] == 2300.0 and columns["car_vel_x"][-1] == 0.0
+    assert (tmp_path / "brake.blut").stat().st_size < (tmp_path / "coast.blut").stat().st_size
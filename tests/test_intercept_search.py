@@ -0,0 +1,115 @@
+import random
+from typing import List, Optional, Sequence
+
+from tools.intercept_search import candidate_indices, first_reachable_index, reach_time
+
+STRIDE = 3
+
+
+def _margins(count: int, first_reachable: int) -> List[float]:
+    # growing margins that turn positive at `first_reachable`
+    return [0.01 * (i - first_reachable) + 0.005 for i in range(count)]
+
+
+def _first_accepted(margins: Sequence[float], accepted: Sequence[bool], indices: Sequence[int]) -> Optional[int]:
+    return next((i for i in indices if margins[i] > 0 and accepted[i]), None)
+
+
+def test_first_reachable_index_with_growing_margins() -> None:
+    for count in (1, 2, 7, 50, 361):
+        for first in range(0, count + 1):
+            margins = _margins(count, first)
+            assert first_reachable_index(margins.__getitem__, count, STRIDE) == first
+
+
+def test_first_reachable_index_falls_back_to_scanning_when_margins_shrink() -> None:
+    # slice 1 is reachable, but stepping from slice 0 to 3 only shows the margin shrinking
+    margins = [-0.5, 0.3, -0.2, -0.8, -0.9, -1.0, 0.2]
+    assert first_reachable_index(margins.__getitem__, len(margins), STRIDE) == 0
+
+
+def test_first_reachable_index_without_reachable_slices() -> None:
+    assert first_reachable_index(lambda i: -1.0 + 0.001 * i, 100, STRIDE) == 100
+    assert first_reachable_index(lambda i: -1.0, 0, STRIDE) == 0
+
+
+def test_candidates_stay_on_the_stride_grid() -> None:
+    assert list(candidate_indices(10, STRIDE)) == [0, 3, 6, 9]
+    assert list(candidate_indices(10, STRIDE, first=4)) == [4, 6, 9]
+    assert list(candidate_indices(10, STRIDE, first=6)) == [6, 9]
+    assert list(candidate_indices(10, STRIDE, first=10)) == []
+    assert list(candidate_indices(20, STRIDE, first=4, spans=[(0, 3), (5, 8), (11, 20)])) == [6, 12, 15, 18]
+    assert list(candidate_indices(20, STRIDE, first=5, spans=[(5, 8)])) == [5, 6]
+    # a run still growing as the prediction is simulated comes again with a later end
+    assert list(candidate_indices(20, STRIDE, first=0, spans=[(0, 4), (0, 9), (11, 20)])) == [0, 3, 6, 12, 15, 18]
+    assert list(candidate_indices(20, STRIDE, first=5, spans=[(0, 4), (0, 9)])) == [5, 6]
+    assert list(candidate_indices(20, STRIDE, first=10, spans=[(0, 4), (0, 9), (11, 20)])) == [12, 15, 18]
+
+
+def test_bisected_search_is_never_later_than_the_strided_scan() -> None:
+    rng = random.Random(12)
+    for _ in range(500):
+        count = rng.randint(1, 120)
+        margins = _margins(count, rng.randint(0, count))
+        accepted = [rng.random() < 0.4 for _ in range(count)]
+        spans = None
+        if rng.random() < 0.5:
+            cuts = sorted(rng.sample(range(count + 1), min(count + 1, 4)))
+            spans = list(zip(cuts[::2], cuts[1::2]))
+
+        scan = _first_accepted(margins, accepted, list(candidate_indices(count, STRIDE, 0, spans)))
+        first = first_reachable_index(margins.__getitem__, count, STRIDE)
+        bisected = _first_accepted(margins, accepted, list(candidate_indices(count, STRIDE, first, spans)))
+        if scan is None:
+            continue
+        assert bisected is not None and bisected <= scan
+
+
+def test_reach_time_interpolates_before_the_found_slice() -> None:
+    times = [i / 120 for i in range(10)]
+    margins = [-0.03, -0.01, 0.01, 0.03, 0.05, 0.07, 0.09, 0.11, 0.13, 0.15]
+    # a bisected search finds slice 2, the first reachable one
+    index, time = reach_time(times, margins.__getitem__, 2, 0)
+    assert index == 2 and abs(time - 1.5 / 120) < 1e-12
+    # a strided scan checked slice 0 and found slice 3, so it looks back at slices 1 and 2
+    index, time = reach_time(times, margins.__getitem__, 3, 1)
+    assert index == 2 and abs(time - 1.5 / 120) < 1e-12
+    # without looking back, the time would be up to two slices late
+    assert reach_time(times, margins.__getitem__, 3, 3) == (3, times[3])
+
+
+def test_reach_time_snaps_to_slices_with_nothing_unreachable_before() -> None:
+    times = [i / 120 for i in range(6)]
+    margins = [0.01, 0.02, 0.03, 0.04, 0.05, 0.06]
+    assert reach_time(times, margins.__getitem__, 3, 1) == (1, times[1])
+    assert reach_time(times, margins.__getitem__, 3, 0) == (0, times[0])
+
+
+def test_reach_time_on_a_strided_scan() -> None:
+    rng = random.Random(18)
+    for _ in range(300):
+        count = rng.randint(4, 100)
+        first_reachable = rng.randint(1, (count - 1) // STRIDE * STRIDE)
+        margins = _margins(count, first_reachable)
+        times = [i / 120 for i in range(count)]
+        found = next(i for i in candidate_indices(count, STRIDE) if margins[i] > 0)
+        index, time = reach_time(times, margins.__getitem__, found, max(found - STRIDE + 1, 0))
+        assert index == first_reachable
+        assert times[first_reachable - 1] < time <= times[first_reachable]
+
+
+def test_reach_time_does_not_look_back_past_rejected_slices() -> None:
+    # everything is reachable, but the strike only accepts balls more than 1.02 s away: a scan from slice 0
+    # checked slice 60 (1.0 s) and rejected it, then accepted slice 63
+    times = [i / 60 for i in range(70)]
+    margins = [0.5] * len(times)
+
+    def accepts(i: int) -> bool:
+        return times[i] > 1.02
+
+    index, time = reach_time(times, margins.__getitem__, 63, 61, accepts)
+    assert (index, time) == (62, times[62]) and accepts(index)
+    # without the predicate, it would settle on slice 61, which the strike rejects
+    assert reach_time(times, margins.__getitem__, 63, 61)[0] == 61
+    # nothing is interpolated towards the rejected slice 60, even when the skipped slices are all accepted
+    assert reach_time(times, margins.__getitem__, 63, 61, lambda i: i > 60) == (61, times[61])
@@ -0,0 +1,39 @@
+import math
+
+from tools.jump_sim import BatchJumpSim, JumpSim, Orientation, height_curve, vec3
+
+DT = 1 / 120
+UPRIGHT = Orientation(vec3(1.0, 0.0, 0.0), vec3(0.0, 1.0, 0.0), vec3(0.0, 0.0, 1.0))
+JUMPS = [(0.2, 0.2 + 3 * DT, 0.0), (0.05, math.inf, 100.0), (0.1, 0.5, -200.0), (0.2, 1.0, 300.0)]
+
+
+def test_batch_lanes_step_exactly_like_single_jumps() -> None:
+    batch = BatchJumpSim([hold for hold, _, _ in JUMPS], [second for _, second, _ in JUMPS],
+                         initial_velocities=[(0.0, 0.0, velocity) for _, _, velocity in JUMPS])
+    states = batch.simulate(DT, until_apex=False)
+
+    for lane, (hold, second, velocity) in enumerate(JUMPS):
+        jump = JumpSim(vec3(0.0, 0.0, 0.0), vec3(0.0, 0.0, velocity), UPRIGHT, hold, second)
+        expected = [(0.0, 0.0, velocity)]
+        while not jump.done:
+            jump.step(DT)
+            expected.append((jump.timer, jump.position[2], jump.velocity[2]))
+        assert states[lane] == expected
+        assert batch.done[lane]
+
+
+def test_lanes_stop_at_their_apex() -> None:
+    batch = BatchJumpSim([0.2, 0.2], [0.2 + 3 * DT, math.inf])
+    batch.simulate(DT)
+    (double_time, double_height, _), (single_time, single_height, _) = batch.apexes()
+    assert double_height > single_height > 200.0
+    assert double_time > single_time
+    assert not any(batch.done)
+    assert all(states[-1][2] < 0 for states in batch.states)
+
+    heights = [0.0, 100.0, single_height + 1.0]
+    curves = batch.height_curves(heights)
+    assert curves[1] == height_curve(batch.states[1], heights)
+    times, velocities = curves[1]
+    assert 0.0 == times[0] < times[1] < times[2] == single_time
+    assert velocities[1] > 0.0 == velocities[2]
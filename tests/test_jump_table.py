@@ -0,0 +1,28 @@
+import pytest
+
+from data.jump_table import JumpTable, height_curve, jump_table, simulate_jump
+
+
+def test_table_matches_simulation_on_grid_points() -> None:
+    table = jump_table()
+    holds, delays, velocities, heights = JumpTable.grid()
+    for hold, delay, velocity in ((0.2, 0.025, 0.0), (0.1, None, 200.0), (0.15, 0.3, -200.0)):
+        times, vertical_velocities = height_curve(simulate_jump(hold, delay, velocity), heights)
+        for height, time, vertical_velocity in zip(heights, times, vertical_velocities):
+            result = table.lookup(height, hold, delay, velocity)
+            assert result[0] == pytest.approx(time, abs=1e-4)
+            assert result[1] == pytest.approx(vertical_velocity, abs=1e-2)
+
+
+def test_double_jump_reaches_higher_and_heights_above_the_apex_clamp() -> None:
+    table = jump_table()
+    single = [table.time_to_height(height) for height in range(0, 600, 10)]
+    double = [table.time_to_height(height, second_jump_delay=0.025) for height in range(0, 600, 10)]
+    assert all(b >= a for a, b in zip(single, single[1:]))
+    assert all(b >= a for a, b in zip(double, double[1:]))
+
+    single_apex, double_apex = single[-1], double[-1]
+    assert table.lookup(590.0) == (single_apex, 0.0)
+    assert table.time_to_height(300.0) == single_apex
+    assert table.lookup(300.0, second_jump_delay=0.025)[1] > 0.0
+    assert table.time_to_height(400.0, second_jump_delay=0.025) < double_apex
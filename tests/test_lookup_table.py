@@ -1,14 +1,101 @@
+import threading
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from data import lookup_table
 from data.lookup_table import LookupTable
 
 
-def test_find_index_includes_last_value():
+def test_find_index_includes_last_value() -> None:
     column = [0.0, 1.0, 2.0]
     assert LookupTable.find_index(column, 2.0) == 2
     assert LookupTable.find_index(column, 99.0) == 2
 
 
-def test_get_rows_reads_csv_data():
+def test_get_rows_reads_csv_data() -> None:
     table = LookupTable("acceleration/boost.csv")
     rows = table.get_rows()
     assert rows
     assert "time" in rows[0]
+
+
+def test_columns_are_parsed_once_and_saved_to_a_sidecar(tmp_path: Path) -> None:
+    csv_path = tmp_path / "table.csv"
+    csv_path.write_text("time,speed\n0.0,1.5\n0.5,2.5\n", encoding="utf-8")
+
+    table = LookupTable(str(csv_path))
+    assert table.get_column("speed") == [1.5, 2.5]
+    assert table.get_columns() is LookupTable(str(csv_path)).get_columns()
+
+    sidecar = tmp_path / ("table.csv" + lookup_table.SIDECAR_SUFFIX)
+    signature = lookup_table._csv_signature(csv_path)
+    mapped = lookup_table._map_sidecar(sidecar, signature)
+    assert list(mapped["time"]) == [0.0, 0.5]
+    assert list(mapped["speed"]) == [1.5, 2.5]
+
+
+def test_stale_sidecar_is_ignored(tmp_path: Path) -> None:
+    csv_path = tmp_path / "table.csv"
+    csv_path.write_text("time\n1.0\n", encoding="utf-8")
+    lookup_table.load_columns(csv_path)
+    sidecar = tmp_path / ("table.csv" + lookup_table.SIDECAR_SUFFIX)
+    assert lookup_table._map_sidecar(sidecar, lookup_table._csv_signature(csv_path))
+
+    csv_path.write_text("time\n1.0\n2.0\n", encoding="utf-8")
+    assert lookup_table._map_sidecar(sidecar, lookup_table._csv_signature(csv_path)) == {}
+
+
+def test_corrupt_sidecar_is_ignored(tmp_path: Path) -> None:
+    csv_path = tmp_path / "table.csv"
+    csv_path.write_text("time\n1.0\n2.0\n", encoding="utf-8")
+    sidecar = tmp_path / ("table.csv" + lookup_table.SIDECAR_SUFFIX)
+    header = b'{"columns": ["time"]}'
+    sidecar.write_bytes(
+        lookup_table._PREFIX.pack(lookup_table.TABLE_MAGIC, lookup_table.TABLE_FORMAT_VERSION, len(header)) + header
+    )
+    assert lookup_table._map_sidecar(sidecar, lookup_table._csv_signature(csv_path)) == {}
+
+    prefix = lookup_table._PREFIX.pack(lookup_table.TABLE_MAGIC, lookup_table.TABLE_FORMAT_VERSION, 4)
+    sidecar.write_bytes(prefix + b"[1]")
+    assert lookup_table._map_sidecar(sidecar, lookup_table._csv_signature(csv_path)) == {}
+    assert list(lookup_table.load_columns(csv_path)["time"]) == [1.0, 2.0]
+
+
+def test_binary_tables_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / ("table" + lookup_table.TABLE_SUFFIX)
+    lookup_table.write_table(path, {"time": [0.0, 0.5], "speed": [1.5, 2.5]}, {"dt": 0.5}, typecode="f")
+
+    metadata, columns = lookup_table.read_table(path)
+    assert metadata == {"dt": 0.5}
+    assert list(columns["speed"]) == [1.5, 2.5]
+    assert LookupTable(str(path)).get_column("time") == [0.0, 0.5]
+
+
+def test_lazy_tables_are_built_once_on_first_use(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(lookup_table, "_registries", [])
+    built = []
+
+    def build() -> List[float]:
+        built.append(1)
+        return [1.0]
+
+    tables = lookup_table.LazyTables({"table": build})
+    assert not tables.is_loaded("table")
+
+    threads = [threading.Thread(target=tables.get, args=("table",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert tables.get("table") == [1.0]
+    assert built == [1]
+
+
+def test_preload_tables_builds_registered_tables(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(lookup_table, "_registries", [])
+    tables = lookup_table.LazyTables({"table": lambda: [2.0]})
+    assert lookup_table._registries == [tables]
+    lookup_table.preload_tables()
+    assert tables.is_loaded("table")
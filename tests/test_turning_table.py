@@ -0,0 +1,38 @@
+import math
+
+from data.turning_table import TurningTable, turning_table, turning_times
+
+
+def test_turning_table_matches_model_on_grid_points() -> None:
+    table = turning_table()
+    heading_errors = [h * TurningTable.HEADING_STEP for h in range(TurningTable.HEADING_COUNT)]
+    for speed, heading, distance in [(0.0, 4, 5), (690.0, 8, 10), (2070.0, 4, 2), (1380.0, 16, 20)]:
+        expected = turning_times(speed, heading_errors, distance * TurningTable.DISTANCE_STEP)[heading]
+        assert abs(table.time(speed, heading_errors[heading], distance * TurningTable.DISTANCE_STEP) - expected) < 1e-4
+
+
+def test_turning_times_grow_with_heading_error_across_the_grid() -> None:
+    table = turning_table()
+    for s in range(TurningTable.SPEED_COUNT):
+        for d in range(TurningTable.DISTANCE_COUNT):
+            speed, distance = s * TurningTable.SPEED_STEP, d * TurningTable.DISTANCE_STEP
+            times = [table.time(speed, h * TurningTable.HEADING_STEP, distance) for h in range(TurningTable.HEADING_COUNT)]
+            assert all(a <= b for a, b in zip(times, times[1:])), (s, d, times)
+
+
+def test_turning_costs_nothing_straight_ahead_and_more_when_facing_away() -> None:
+    table = turning_table()
+    for speed in (0.0, 1000.0, 2300.0):
+        assert table.time(speed, 0.0, 3000.0) < 1e-9
+        assert table.time(speed, math.pi, 3000.0) > table.time(speed, math.pi / 4, 3000.0) > 0.0
+    # lookups are clamped to the table
+    assert table.time(5000.0, -math.pi, 1e6) == table.time(2300.0, math.pi, 6000.0)
+
+
+def test_turning_around_from_standstill_takes_about_a_second() -> None:
+    # a car accelerates through the turn, so facing away from a target further than a turning circle away
+    # costs about as long as turning around in place does in game, not seconds of crawling at full lock
+    table = turning_table()
+    for distance in (1500.0, 3000.0, 6000.0):
+        assert 0.5 < table.time(0.0, math.pi, distance) < 1.2
+    assert table.time(0.0, math.pi / 2, 3000.0) < 0.5
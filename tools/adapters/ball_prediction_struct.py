@@ -0,0 +1,73 @@
+"""Zero-copy access to RLBot's ctypes BallPrediction struct."""
+
+from __future__ import annotations
+
+import ctypes
+from bisect import bisect_left, bisect_right
+from typing import Any
+
+PHYSICS_VECTORS = ("location", "velocity", "angular_velocity")
+
+
+def _field(struct_type: Any, name: str) -> Any:
+    for field_name, field_type in getattr(struct_type, "_fields_", ()):
+        if field_name == name:
+            return field_type
+    raise TypeError(f"{struct_type.__name__} has no field {name!r}")
+
+
+def is_ball_prediction_struct(prediction: object) -> bool:
+    if not isinstance(prediction, ctypes.Structure):
+        return False
+    field_names = {field[0] for field in getattr(prediction, "_fields_", ())}
+    return "slices" in field_names and "num_slices" in field_names
+
+
+class BallPredictionStructView:
+    """Strided float views over the slices of a ctypes BallPrediction.
+
+    The struct memory is reinterpreted once as a flat float array, and every physics component becomes
+    a strided slice of it, so reading the prediction involves no per-slice Python work.
+    """
+
+    def __init__(self, prediction: ctypes.Structure):
+        slices_type = _field(type(prediction), "slices")
+        slice_type = slices_type._type_
+        physics_type = _field(slice_type, "physics")
+
+        slice_size = ctypes.sizeof(slice_type)
+        float_size = ctypes.sizeof(ctypes.c_float)
+        if slice_size % float_size or _field(slice_type, "game_seconds") is not ctypes.c_float:
+            raise TypeError("ball prediction slices are not made of floats")
+
+        slices_offset = type(prediction).slices.offset
+        raw = memoryview(prediction).cast("B")
+        floats = raw[slices_offset:slices_offset + ctypes.sizeof(slices_type)].cast("f")
+
+        self.num_slices = max(0, min(int(getattr(prediction, "num_slices")), slices_type._length_))
+        stride = slice_size // float_size
+
+        def column(byte_offset: int) -> memoryview[float]:
+            if byte_offset % float_size:
+                raise TypeError("misaligned float field in ball prediction struct")
+            return floats[byte_offset // float_size::stride][:self.num_slices]
+
+        self.time = column(slice_type.game_seconds.offset)
+        self.vectors: list[memoryview[float]] = []
+        physics_offset = slice_type.physics.offset
+        for vector_name in PHYSICS_VECTORS:
+            vector_type = _field(physics_type, vector_name)
+            vector_offset = physics_offset + getattr(physics_type, vector_name).offset
+            for component in ("x", "y", "z"):
+                if _field(vector_type, component) is not ctypes.c_float:
+                    raise TypeError(f"{vector_name}.{component} is not a float")
+                self.vectors.append(column(vector_offset + getattr(vector_type, component).offset))
+
+    def select(self, start_time: float, end_time: float, step: int = 1) -> list[memoryview[float]]:
+        """Columns (time, position xyz, velocity xyz, angular velocity xyz) of every `step`-th slice
+        with start_time <= time <= end_time, still as views into the struct."""
+        step = max(1, step)
+        first = bisect_left(self.time, start_time)
+        first = -(-first // step) * step  # keep the same slice alignment as walking from index 0
+        last = bisect_right(self.time, end_time)
+        return [column[first:last:step] for column in [self.time, *self.vectors]]
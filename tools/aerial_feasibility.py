@@ -0,0 +1,28 @@
+import math
+from typing import Sequence
+
+GRAVITY = -650.0
+# upper bounds on what a car can add to its motion during an aerial, a bit above the real values
+# (boost plus air throttle accelerate by about 1058 uu/s^2, a jump with full hold adds about 583 uu/s
+# and a double jump another 292 uu/s), so the miss distance bound never rules out a reachable target
+MAX_AERIAL_ACCELERATION = 1100.0
+MAX_JUMP_VELOCITY = 600.0
+MAX_DOUBLE_JUMP_VELOCITY = 900.0
+
+Vector = Sequence[float]
+
+
+def minimum_miss_distance(relative_target: Vector, velocity: Vector, time_left: float, double_jump: bool) -> float:
+    """
+    Lower bound on how far from the target an aerial can end up, from where the car would coast to
+    under gravity alone and how much jumping and boosting could move it from there.
+    :param relative_target: Target position minus car position
+    :param time_left: Time until the car should be at the target
+    """
+    time_left = max(time_left, 0.0)
+    dx = relative_target[0] - velocity[0] * time_left
+    dy = relative_target[1] - velocity[1] * time_left
+    dz = relative_target[2] - velocity[2] * time_left - 0.5 * GRAVITY * time_left * time_left
+    jump_velocity = MAX_DOUBLE_JUMP_VELOCITY if double_jump else MAX_JUMP_VELOCITY
+    reach = 0.5 * MAX_AERIAL_ACCELERATION * time_left * time_left + jump_velocity * time_left
+    return max(math.sqrt(dx * dx + dy * dy + dz * dz) - reach, 0.0)
@@ -0,0 +1,494 @@
+"""Preallocated structure-of-arrays storage for ball prediction trajectories."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union, overload
+
+VectorFactory = Callable[[float, float, float], Any]
+
+
+def _tuple_vector(x: float, y: float, z: float) -> Any:
+    return x, y, z
+
+
+def first_crossing_time(
+    times: Sequence[float],
+    values: Sequence[float],
+    count: int,
+    limit: float,
+    below: bool,
+    start_time: float,
+    start_value: float,
+) -> Optional[float]:
+    """Time at which `values` first goes past `limit` (below it, or above it), linearly interpolated
+    between the two slices around the crossing. `start_time`/`start_value` describe the state before
+    the first slice. Returns None if the limit is never crossed."""
+    if count == 0:
+        return None
+
+    # a single C-level pass rules out the common case of no crossing at all
+    window = memoryview(values)[:count] if isinstance(values, array) else values[:count]
+    if (min(window) >= limit) if below else (max(window) <= limit):
+        return None
+
+    previous_time, previous_value = start_time, start_value
+    for i in range(count):
+        value = values[i]
+        if (value < limit) if below else (value > limit):
+            crossed_before = (previous_value < limit) if below else (previous_value > limit)
+            if crossed_before or value == previous_value:
+                return times[i]
+            ratio = (limit - previous_value) / (value - previous_value)
+            return previous_time + (times[i] - previous_time) * ratio
+        previous_time, previous_value = times[i], value
+    return None
+
+
+class BallSlice:
+    """Lightweight view of one slice in a BallPrediction.
+
+    Only valid until the owning prediction is recomputed, copy the values out if they need to be kept.
+    """
+
+    __slots__ = ("_prediction", "_index")
+
+    def __init__(self, prediction: "BallPrediction", index: int):
+        self._prediction = prediction
+        self._index = index
+
+    @property
+    def time(self) -> float:
+        return self._prediction.time[self._index]
+
+    @property
+    def position(self) -> Any:
+        p, i = self._prediction, self._index
+        return p.vector_type(p.position_x[i], p.position_y[i], p.position_z[i])
+
+    @property
+    def velocity(self) -> Any:
+        p, i = self._prediction, self._index
+        return p.vector_type(p.velocity_x[i], p.velocity_y[i], p.velocity_z[i])
+
+    @property
+    def angular_velocity(self) -> Any:
+        p, i = self._prediction, self._index
+        return p.vector_type(p.angular_velocity_x[i], p.angular_velocity_y[i], p.angular_velocity_z[i])
+
+
+class BallState:
+    """Ball state that does not belong to any prediction buffer, e.g. interpolated between two slices."""
+
+    __slots__ = ("time", "position", "velocity", "angular_velocity")
+
+    def __init__(self, time: float, position: Any, velocity: Any, angular_velocity: Any):
+        self.time = time
+        self.position = position
+        self.velocity = velocity
+        self.angular_velocity = angular_velocity
+
+
+class _HeightScan:
+    """Height runs of a BallPrediction version over its first `scanned` slices, `start` being the start
+    of a run still going on at the last of them, or -1."""
+
+    def __init__(self, version: int):
+        self.version = version
+        self.scanned = 0
+        self.start = -1
+        self.spans: List[Tuple[int, int]] = []
+
+
+class BallPrediction(Sequence):  # type: ignore[type-arg]
+    """Ball trajectory stored as contiguous float arrays, reused across ticks.
+
+    Indexing returns BallSlice views, so code written against a list of Ball objects keeps working.
+    The trajectory can be extended lazily: `len()` reports the promised slices, and reading past the
+    simulated ones asks the extender for more, so consumers that stop early never pay for the rest.
+    """
+
+    EXTEND_CHUNK = 12  # slices simulated at least per on-demand extension
+
+    def __init__(self, vector_type: VectorFactory = _tuple_vector, capacity: int = 720):
+        self.vector_type = vector_type
+        self.count = 0
+        self.dt = 0.0  # nominal spacing between slices, used for direct index math
+        self.target_count = 0
+        self.version = 0  # bumped whenever existing slices change, appending only changes `count`
+        self._extender: Optional[Callable[[int], None]] = None
+        self._height_scans: Dict[Tuple[float, float], _HeightScan] = {}
+        self.time = array("d")
+        self.position_x = array("d")
+        self.position_y = array("d")
+        self.position_z = array("d")
+        self.velocity_x = array("d")
+        self.velocity_y = array("d")
+        self.velocity_z = array("d")
+        self.angular_velocity_x = array("d")
+        self.angular_velocity_y = array("d")
+        self.angular_velocity_z = array("d")
+        self._reserve(capacity)
+
+    @property
+    def columns(self) -> List[array]:  # type: ignore[type-arg]
+        return [
+            self.time,
+            self.position_x, self.position_y, self.position_z,
+            self.velocity_x, self.velocity_y, self.velocity_z,
+            self.angular_velocity_x, self.angular_velocity_y, self.angular_velocity_z,
+        ]
+
+    @property
+    def capacity(self) -> int:
+        return len(self.time)
+
+    def _reserve(self, capacity: int):
+        missing = capacity - self.capacity
+        if missing <= 0:
+            return
+        padding = array("d", bytes(8 * missing))
+        for column in self.columns:
+            column.extend(padding)
+
+    def clear(self):
+        self.version += 1
+        self.count = 0
+        self.target_count = 0
+        self._extender = None
+
+    def extend_lazily(self, target_count: int, extender: Callable[[int], None]):
+        """Promise `target_count` slices, `extender(count)` must append slices until there are `count`."""
+        self.target_count = max(target_count, self.count)
+        self._extender = extender
+
+    def materialize(self, count: Optional[int] = None):
+        """Make sure the first `count` promised slices (all of them by default) are simulated."""
+        if count is None:
+            count = self.target_count
+        if count <= self.count or self._extender is None:
+            return
+        self._extender(min(max(count, self.count + self.EXTEND_CHUNK), self.target_count))
+
+    def _materialize_until(self, time: float):
+        while self.count < self.target_count and (self.count == 0 or self.time[self.count - 1] < time):
+            ahead = 1
+            if self.count and self.dt > 0:
+                ahead = max(1, math.ceil((time - self.time[self.count - 1]) / self.dt))
+            before = self.count
+            self.materialize(self.count + ahead)
+            if self.count == before:
+                return
+
+    def append(self, time: float, position: Any, velocity: Any, angular_velocity: Any):
+        i = self.count
+        if i >= self.capacity:
+            self._reserve(max(2 * self.capacity, 1))
+        self._write(i, time, position, velocity, angular_velocity)
+        self.count = i + 1
+        self.target_count = max(self.target_count, self.count)
+
+    def append_ball(self, ball: Any):
+        self.append(ball.time, ball.position, ball.velocity, ball.angular_velocity)
+
+    def replace_ball(self, index: int, ball: Any):
+        """Overwrite simulated slice `index` with the state of `ball`."""
+        if not 0 <= index < self.count:
+            raise IndexError("ball prediction index out of range")
+        self._write(index, ball.time, ball.position, ball.velocity, ball.angular_velocity)
+        self.version += 1
+
+    def _write(self, i: int, time: float, position: Any, velocity: Any, angular_velocity: Any):
+        self.time[i] = time
+        self.position_x[i] = position[0]
+        self.position_y[i] = position[1]
+        self.position_z[i] = position[2]
+        self.velocity_x[i] = velocity[0]
+        self.velocity_y[i] = velocity[1]
+        self.velocity_z[i] = velocity[2]
+        self.angular_velocity_x[i] = angular_velocity[0]
+        self.angular_velocity_y[i] = angular_velocity[1]
+        self.angular_velocity_z[i] = angular_velocity[2]
+
+    def fill_towards(self, time: float, position: Any, velocity: Any, angular_velocity: Any, steps: int):
+        """Append `steps` evenly spaced slices linearly interpolated from the last slice to the given state,
+        the last of them being the state itself. Used to keep the slices uniform when simulating coarsely."""
+        last = self.count - 1
+        if last < 0:
+            raise IndexError("fill_towards needs a slice to interpolate from")
+
+        start = [column[last] for column in self.columns]
+        end = [time]
+        for vector in (position, velocity, angular_velocity):
+            end.extend((vector[0], vector[1], vector[2]))
+        for step in range(1, steps + 1):
+            ratio = step / steps
+            values = [a + (b - a) * ratio for a, b in zip(start, end)]
+            self.append(values[0], values[1:4], values[4:7], values[7:10])
+
+    def truncate(self, count: int):
+        """Forget simulated slices from index `count` on, keeping the promised length."""
+        self.version += 1
+        self.count = max(0, min(count, self.count))
+
+    def assign(self, columns: Sequence[Sequence[float]]):
+        """Replace the whole trajectory at once from columns in the same order as `columns`."""
+        count = len(columns[0]) if columns else 0
+        self._reserve(count)
+        for column, values in zip(self.columns, columns):
+            column[0:count] = array("d", values)
+        self.version += 1
+        self.count = count
+        self.target_count = count
+        self._extender = None
+
+    def drop_front(self, amount: int):
+        """Remove the first `amount` slices, shifting the rest to the start of the arrays."""
+        amount = max(0, min(amount, self.count))
+        remaining = self.count - amount
+        if amount and remaining:
+            for column in self.columns:
+                column[0:remaining] = column[amount:self.count]
+        self.version += 1
+        self.count = remaining
+        self.target_count -= amount
+
+    def count_before(self, time: float) -> int:
+        """Number of slices earlier than `time`, computed from the uniform `dt` spacing."""
+        self._materialize_until(time)
+        count = self.count
+        if count == 0:
+            return 0
+
+        times = self.time
+        if self.dt > 0:
+            index = max(0, min(math.ceil((time - times[0]) / self.dt), count))
+        else:
+            index = 0
+
+        # fix up rounding errors and slices that are not exactly dt apart
+        while index > 0 and times[index - 1] >= time:
+            index -= 1
+        while index < count and times[index] < time:
+            index += 1
+        return index
+
+    def slice_at(self, time: float, interpolate: bool = False) -> Union[BallSlice, BallState]:
+        """The first slice at or after `time` (the last one if `time` is past the end),
+        or the state linearly interpolated between the two neighbouring slices."""
+        index = self.count_before(time)  # simulates promised slices up to `time` first
+        if self.count == 0:
+            raise IndexError("ball prediction is empty")
+
+        if not interpolate or index == 0 or index == self.count:
+            return BallSlice(self, min(index, self.count - 1))
+
+        before = index - 1
+        t0 = self.time[before]
+        ratio = (time - t0) / max(self.time[index] - t0, 1e-9)
+
+        def lerp(xs: array, ys: array, zs: array) -> Any:  # type: ignore[type-arg]
+            return self.vector_type(
+                xs[before] + (xs[index] - xs[before]) * ratio,
+                ys[before] + (ys[index] - ys[before]) * ratio,
+                zs[before] + (zs[index] - zs[before]) * ratio,
+            )
+
+        return BallState(
+            time,
+            lerp(self.position_x, self.position_y, self.position_z),
+            lerp(self.velocity_x, self.velocity_y, self.velocity_z),
+            lerp(self.angular_velocity_x, self.angular_velocity_y, self.angular_velocity_z),
+        )
+
+    def height_spans(self, low: float, high: float) -> Iterator[Tuple[int, int]]:
+        """Index ranges [start, end) of consecutive slices with low <= height <= high, in order. Promised slices
+        are only simulated when the ranges past the simulated ones are asked for, so a run reaching the last
+        simulated slice is yielded that far, then again with the same start and a later end.
+        The scan is kept until the trajectory changes, so strikes looking for the same band share it."""
+        version = self.version
+        yielded = 0
+        while True:
+            scan = self._scan_heights(low, high)
+            while yielded < len(scan.spans):
+                yield scan.spans[yielded]
+                yielded += 1
+            if scan.start >= 0:
+                yield scan.start, scan.scanned
+
+            count = self.count
+            self.materialize(count + 1)
+            if self.count == count or self.version != version:
+                return
+
+    def _scan_heights(self, low: float, high: float) -> "_HeightScan":
+        scan = self._height_scans.get((low, high))
+        if scan is None or scan.version != self.version:
+            if any(entry.version != self.version for entry in self._height_scans.values()):
+                self._height_scans.clear()
+            scan = self._height_scans[(low, high)] = _HeightScan(self.version)
+
+        heights = self.position_z
+        start = scan.start
+        for i in range(scan.scanned, self.count):
+            if low <= heights[i] <= high:
+                if start < 0:
+                    start = i
+            elif start >= 0:
+                scan.spans.append((start, i))
+                start = -1
+        scan.start = start
+        scan.scanned = self.count
+        return scan
+
+    def window(self, start_time: float, end_time: float) -> List[BallSlice]:
+        """Slices with start_time <= time < end_time."""
+        return self[self.count_before(start_time):self.count_before(end_time)]
+
+    def __len__(self) -> int:
+        return max(self.count, self.target_count)
+
+    @overload
+    def __getitem__(self, index: int) -> BallSlice: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[BallSlice]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[BallSlice, List[BallSlice]]:
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            if indices:
+                self.materialize(max(indices[0], indices[-1]) + 1)
+            return [BallSlice(self, i) for i in indices if i < self.count]
+        if index < 0:
+            index += len(self)
+        self.materialize(index + 1)
+        if not 0 <= index < self.count:
+            raise IndexError("ball prediction index out of range")
+        return BallSlice(self, index)
+
+    def __iter__(self) -> Iterator[BallSlice]:
+        i = 0
+        while i < len(self):
+            self.materialize(i + 1)
+            if i >= self.count:
+                return
+            yield BallSlice(self, i)
+            i += 1
+
+
+# how far the ball may drift from the trajectory predicted for it before that is simulated again
+REUSE_POSITION_TOLERANCE = 5.0
+REUSE_VELOCITY_TOLERANCE = 15.0
+REUSE_ANGULAR_VELOCITY_TOLERANCE = 0.5
+
+
+def reusable_slice_count(
+    prediction: BallPrediction,
+    prediction_dt: float,
+    prediction_touch_time: float,
+    ball: Any,
+    time: float,
+    dt: float,
+    touch_time: float,
+) -> int:
+    """
+    Number of leading slices of `prediction` up to `time`, to drop so it continues from `ball` at `time`,
+    or 0 when it has to be simulated again: the step changed, the ball was touched since it was predicted
+    (last touch at `prediction_touch_time` then, `touch_time` now), or the ball no longer follows it.
+    """
+    if prediction_dt != dt or prediction_touch_time != touch_time or prediction.count == 0:
+        return 0
+
+    index = round((time - prediction.time[0]) / dt)
+    if index < 0 or index >= prediction.count - 1 or abs(prediction.time[index] - time) > dt / 2:
+        return 0
+
+    p = prediction
+    position, velocity, angular_velocity = ball.position, ball.velocity, ball.angular_velocity
+    if (
+        math.hypot(p.position_x[index] - position[0], p.position_y[index] - position[1],
+                   p.position_z[index] - position[2]) > REUSE_POSITION_TOLERANCE
+        or math.hypot(p.velocity_x[index] - velocity[0], p.velocity_y[index] - velocity[1],
+                      p.velocity_z[index] - velocity[2]) > REUSE_VELOCITY_TOLERANCE
+        or math.hypot(p.angular_velocity_x[index] - angular_velocity[0],
+                      p.angular_velocity_y[index] - angular_velocity[1],
+                      p.angular_velocity_z[index] - angular_velocity[2]) > REUSE_ANGULAR_VELOCITY_TOLERANCE
+    ):
+        return 0
+    return index + 1
+
+
+def simulate_ball_slices(
+    prediction: BallPrediction, cursor: Any, count: int, dt: float, coarse_steps: int, fine_until: float
+) -> float:
+    """Step `cursor` and append slices until `prediction` has `count` of them. Past `fine_until`, the ball
+    is stepped `coarse_steps` slices at a time and the slices in between are interpolated, so they stay
+    `dt` apart for index math and strides. Returns the time coarse simulation started from, or inf."""
+    coarse_from = math.inf
+    while prediction.count < count:
+        if coarse_steps == 1 or cursor.time < fine_until or prediction.count == 0:
+            cursor.step(dt)
+            prediction.append_ball(cursor)
+        else:
+            steps = max(1, min(coarse_steps, max(count, prediction.target_count) - prediction.count))
+            coarse_from = min(coarse_from, cursor.time)
+            cursor.step(dt * steps)
+            prediction.fill_towards(cursor.time, cursor.position, cursor.velocity, cursor.angular_velocity, steps)
+    return coarse_from
+
+
+def refine_ball_slices(prediction: BallPrediction, cursor: Any, index: int, dt: float, fine_until: float) -> int:
+    """Step `cursor`, the ball at the slice before `index`, and overwrite the slices from `index` on with it
+    while it is earlier than `fine_until`, like simulate_ball_slices would have simulated them.
+    Returns the index of the first slice left as it was."""
+    while index < prediction.count and cursor.time < fine_until:
+        cursor.step(dt)
+        prediction.replace_ball(index, cursor)
+        index += 1
+    return index
+
+
+class TrajectoryCache:
+    """Bounded LRU cache of ball trajectories, stored with times relative to their start."""
+
+    def __init__(self, size: int = 16):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Tuple[List[array], float]] = OrderedDict()  # type: ignore[type-arg]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def store(self, key: Hashable, prediction: BallPrediction, start_time: float, coarse_from: float = math.inf):
+        """Remember the simulated slices of `prediction`, which started from the ball at `start_time`."""
+        if self.size <= 0 or prediction.count == 0:
+            return
+        count = prediction.count
+        columns = [array("d", column[:count]) for column in prediction.columns]
+        columns[0] = array("d", map((-start_time).__add__, columns[0]))
+        self._entries[key] = columns, coarse_from - start_time
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def restore(self, key: Hashable, prediction: BallPrediction, start_time: float, max_count: int) -> Optional[float]:
+        """Load at most `max_count` slices of the trajectory stored under `key` into `prediction`, re-based
+        to `start_time`. Returns the re-based time coarse simulation started from (inf if it never did),
+        or None if nothing is stored under `key`."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+
+        columns, coarse_from = entry
+        count = min(len(columns[0]), max_count)
+        times = array("d", map(start_time.__add__, columns[0][:count]))
+        prediction.assign([times, *(column[:count] for column in columns[1:])])
+        return coarse_from + start_time
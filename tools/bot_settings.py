@@ -31,6 +31,9 @@ class ObjectModeSettings:
     mode: str
     use_rlbot_prediction_for_ball: bool
     use_rlbot_prediction_for_puck: bool
+    incremental_ball_prediction: bool
+    prediction_fine_horizon: float
+    prediction_coarse_rate: float
     ball_rest_height: float
     puck_rest_height: float
     ball_ground_cutoff: float
@@ -282,6 +285,9 @@ def default_settings() -> BotSettings:
             mode="auto",
             use_rlbot_prediction_for_ball=False,
             use_rlbot_prediction_for_puck=True,
+            incremental_ball_prediction=True,
+            prediction_fine_horizon=1.5,
+            prediction_coarse_rate=120.0,
             ball_rest_height=93.0,
             puck_rest_height=60.0,
             ball_ground_cutoff=220.0,
@@ -340,6 +346,21 @@ def load_bot_settings(path: Path | str = DEFAULT_SETTINGS_PATH) -> BotSettings:
             "use_rlbot_prediction_for_puck",
             defaults.object_mode.use_rlbot_prediction_for_puck,
         ),
+        incremental_ball_prediction=_get_bool(
+            parser,
+            "Object",
+            "incremental_ball_prediction",
+            defaults.object_mode.incremental_ball_prediction,
+        ),
+        prediction_fine_horizon=max(
+            0.0,
+            _get_float(parser, "Object", "prediction_fine_horizon", defaults.object_mode.prediction_fine_horizon),
+        ),
+        prediction_coarse_rate=_clamp(
+            _get_float(parser, "Object", "prediction_coarse_rate", defaults.object_mode.prediction_coarse_rate),
+            10.0,
+            120.0,
+        ),
         ball_rest_height=_get_float(parser, "Object", "ball_rest_height", defaults.object_mode.ball_rest_height),
         puck_rest_height=_get_float(parser, "Object", "puck_rest_height", defaults.object_mode.puck_rest_height),
         ball_ground_cutoff=_get_float(
@@ -451,6 +472,12 @@ mode = auto
 use_rlbot_prediction_for_puck = true
 ; Optional. Usually false unless you want game prediction for normal ball too.
 use_rlbot_prediction_for_ball = false
+; Reuse last tick's prediction when the ball still follows it, only simulating the missing tail.
+incremental_ball_prediction = true
+; Ball prediction is simulated at full rate (120 Hz) for the first prediction_fine_horizon seconds,
+; then at prediction_coarse_rate Hz with slices interpolated in between. 120 disables the coarse part.
+prediction_fine_horizon = 1.5
+prediction_coarse_rate = 120
 
 ; Object shape tuning for decisions/rendering.
 ball_rest_height = 93
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Tuple
+import ctypes
+import math
+from bisect import bisect_right
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket
 
 from rlutilities.linear_algebra import vec3, vec2, norm, normalize, cross, rotation, dot, xy
 from rlutilities.simulation import Game, Car, Ball, BoostPad, BoostPadType
+from tools.adapters.ball_prediction_struct import BallPredictionStructView, is_ball_prediction_struct
 from tools.adapters.rlbot_protocols import BallPredictionLike
+from tools.ball_prediction import (
+    BallPrediction, BallSlice, BallState, TrajectoryCache, first_crossing_time, refine_ball_slices,
+    reusable_slice_count, simulate_ball_slices,
+)
 from tools.bot_settings import BotSettings, default_settings
+from tools.intercept import ArrivalTimes, Intercept
 from tools.math import clamp01
 from tools.vector_math import distance
 
@@ -27,6 +36,13 @@ class Goal:
     def inside(self, pos) -> bool:
         return pos[1] < -Goal.DISTANCE if self.team == 0 else pos[1] > Goal.DISTANCE
 
+    def crossing_time(self, prediction: BallPrediction, start_time: float, start_y: float) -> Optional[float]:
+        """Interpolated time at which the predicted ball first crosses this goal's line, if it does."""
+        limit = -Goal.DISTANCE if self.team == 0 else Goal.DISTANCE
+        return first_crossing_time(
+            prediction.time, prediction.position_y, prediction.count, limit, self.team == 0, start_time, start_y
+        )
+
     @property
     def center(self):
         return vec3(0, -self.sign * Goal.DISTANCE, Goal.HEIGHT / 2.0)
@@ -41,14 +57,25 @@ class GameInfo(Game):
         self.their_goal = Goal(1 - team)
         self.settings = settings or default_settings()
 
-        self.ball_predictions: List[Ball] = []
-        self.about_to_score = False
-        self.about_to_be_scored_on = False
-        self.time_of_goal = -1
+        self.ball_predictions = BallPrediction(vec3)
+        self._about_to_score = False
+        self._about_to_be_scored_on = False
+        self._time_of_goal = -1.0
+        self._goal_detected = False
+        self._prediction_cursor: Optional[Ball] = None
+        self._coarse_prediction_from = math.inf
         self._prediction_time = -1.0
         self._prediction_duration = 0.0
         self._prediction_dt = 0.0
-        self._external_ball_prediction: Optional[BallPredictionLike] = None
+        self._prediction_is_internal = False
+        self._prediction_touch_time = -1.0
+        self._ball_touch_time = -1.0
+        self._external_ball_prediction: Optional[Union[BallPredictionLike, ctypes.Structure]] = None
+        self.prediction_cache = TrajectoryCache(self.PREDICTION_CACHE_SIZE)
+        self._prediction_cache_key: Optional[Tuple] = None
+        self._prediction_cache_start = 0.0
+        self._intercepts: Dict[Tuple, Intercept] = {}
+        self._arrival_times: Dict[Tuple[int, bool], Tuple[Tuple[int, int], ArrivalTimes]] = {}
 
         self.large_boost_pads: List[BoostPad] = []
         self.small_boost_pads: List[BoostPad] = []
@@ -82,6 +109,11 @@ class GameInfo(Game):
             pad.timer = 4.0 - pad.timer
 
         self._prediction_time = -1.0
+        self._intercepts.clear()
+        self._arrival_times.clear()
+
+        latest_touch = getattr(packet.game_ball, "latest_touch", None)
+        self._ball_touch_time = float(getattr(latest_touch, "time_seconds", -1.0))
 
         car_count = getattr(packet, "num_cars", len(self.cars))
         for i in range(car_count):
@@ -92,7 +124,7 @@ class GameInfo(Game):
         self._update_object_mode(packet)
         self._update_human_aggression()
 
-    def set_external_ball_prediction(self, prediction: Optional[BallPredictionLike]) -> None:
+    def set_external_ball_prediction(self, prediction: Optional[Union[BallPredictionLike, ctypes.Structure]]) -> None:
         self._external_ball_prediction = prediction
 
     def get_teammates(self, my_car: Car) -> List[Car]:
@@ -127,28 +159,219 @@ class GameInfo(Game):
     def is_puck(self) -> bool:
         return self.object_mode == "puck"
 
+    # trajectories from repeated ball states (kickoffs, resets, resting balls) are cached by quantized state
+    PREDICTION_CACHE_SIZE = 16
+    PREDICTION_CACHE_POSITION_RESOLUTION = 1.0
+    PREDICTION_CACHE_VELOCITY_RESOLUTION = 1.0
+    PREDICTION_CACHE_ANGULAR_VELOCITY_RESOLUTION = 0.01
+
     def predict_ball(self, duration=5.0, dt=1 / 120):
-        if (
-            self._prediction_time == self.time
-            and self._prediction_duration >= duration
-            and self._prediction_dt <= dt
-            and self.ball_predictions
-        ):
-            return
+        """Prepare the ball prediction for the next `duration` seconds.
+
+        The internal simulation runs lazily: slices are simulated only once something reads them,
+        and asking for a longer horizon continues the existing trajectory.
+        """
+        if self._prediction_time == self.time and self._prediction_dt <= dt and self.ball_predictions:
+            if self._prediction_duration >= duration:
+                return
+            if self._prediction_is_internal:
+                self._prediction_duration = duration
+                self._goal_detected = False
+                self._schedule_internal_prediction()
+                return
+
+        self._store_cached_prediction()
+        use_external = self._should_use_external_prediction()
+        reusable_slices = 0 if use_external else self._reusable_prediction_slices(dt)
 
         self._prediction_time = self.time
         self._prediction_duration = duration
         self._prediction_dt = dt
+        self._prediction_touch_time = self._ball_touch_time
+
+        self._goal_detected = False
+
+        if reusable_slices > 0:
+            self.ball_predictions.drop_front(reusable_slices)
+            self._refine_reused_prediction()
+            self._schedule_internal_prediction()
+            return
 
-        self.about_to_score = False
-        self.about_to_be_scored_on = False
-        self.time_of_goal = -1
+        self.ball_predictions.clear()
+        self._prediction_is_internal = False
+        if use_external and self._predict_ball_external(duration, dt):
+            return
 
-        self.ball_predictions = []
-        if self._should_use_external_prediction() and self._predict_ball_external(duration, dt):
+        self._prediction_is_internal = True
+        if self._load_cached_prediction():
             return
 
-        self._predict_ball_internal(duration, dt)
+        self._prediction_cursor = Ball(self.ball)
+        self._coarse_prediction_from = math.inf
+        self._schedule_internal_prediction()
+
+    @property
+    def about_to_score(self) -> bool:
+        self._detect_goal()
+        return self._about_to_score
+
+    @property
+    def about_to_be_scored_on(self) -> bool:
+        self._detect_goal()
+        return self._about_to_be_scored_on
+
+    @property
+    def time_of_goal(self) -> float:
+        self._detect_goal()
+        return self._time_of_goal
+
+    def _detect_goal(self):
+        """Find the first goal line crossing of the whole prediction, interpolated between slices,
+        so the goal time does not depend on the prediction dt."""
+        if self._goal_detected:
+            return
+        self.ball_predictions.materialize()
+        self._goal_detected = True
+
+        start_time = self._prediction_time
+        start_y = self.ball.position[1]
+        conceded = self.my_goal.crossing_time(self.ball_predictions, start_time, start_y)
+        scored = self.their_goal.crossing_time(self.ball_predictions, start_time, start_y)
+
+        self._about_to_be_scored_on = conceded is not None and (scored is None or conceded <= scored)
+        self._about_to_score = scored is not None and not self._about_to_be_scored_on
+        if self._about_to_be_scored_on:
+            self._time_of_goal = conceded
+        elif self._about_to_score:
+            self._time_of_goal = scored
+        else:
+            self._time_of_goal = -1.0
+
+    def ball_at(self, time: float, interpolate: bool = False) -> Optional[Union[BallSlice, BallState]]:
+        """Predicted ball at `time` in constant time, from the prediction made by the last predict_ball call."""
+        if not self.ball_predictions:
+            return None
+        return self.ball_predictions.slice_at(time, interpolate)
+
+    def ball_window(self, start_time: float, end_time: float) -> List[BallSlice]:
+        """Predicted slices with start_time <= time < end_time."""
+        return self.ball_predictions.window(start_time, end_time)
+
+    def intercept(
+        self,
+        car: Car,
+        predicate: Optional[Callable[[Car, Ball], bool]] = None,
+        backwards: bool = False,
+        height_range: Optional[Tuple[float, float]] = None,
+        bisect: bool = False,
+        interpolate: bool = False,
+    ) -> Intercept:
+        """Intercept of `car` with the current ball prediction, shared by everything that asks this tick.
+        Bound predicates are told apart by their class and function, so they must not depend on
+        anything but the class, the car and this GameInfo. Callers must not modify the result."""
+        return self._shared_intercept(car, predicate, backwards, height_range, bisect, interpolate, None)
+
+    def intercepts_both_ways(
+        self,
+        car: Car,
+        predicate: Optional[Callable[[Car, Ball], bool]] = None,
+        height_range: Optional[Tuple[float, float]] = None,
+        bisect: bool = False,
+        interpolate: bool = False,
+    ) -> Tuple[Intercept, Intercept]:
+        """Forward and backward intercepts of `car`, which share the slice geometry and predicate results."""
+        self.arrival_times(car, False)
+        self.arrival_times(car, True)  # paired with the forward estimates from here on
+        predicate_results: Dict[int, bool] = {}
+        return (
+            self._shared_intercept(car, predicate, False, height_range, bisect, interpolate, predicate_results),
+            self._shared_intercept(car, predicate, True, height_range, bisect, interpolate, predicate_results),
+        )
+
+    def _shared_intercept(
+        self,
+        car: Car,
+        predicate: Optional[Callable[[Car, Ball], bool]],
+        backwards: bool,
+        height_range: Optional[Tuple[float, float]],
+        bisect: bool,
+        interpolate: bool,
+        predicate_results: Optional[Dict[int, bool]],
+    ) -> Intercept:
+        owner = getattr(predicate, "__self__", None)
+        predicate_key = predicate if owner is None else (type(owner), predicate.__func__)
+        prediction = self.ball_predictions
+        key = (car.id, predicate_key, backwards, height_range, bisect, interpolate, prediction.version,
+               len(prediction))
+
+        intercept = self._intercepts.get(key)
+        if intercept is None:
+            intercept = Intercept(car, prediction, predicate, backwards=backwards, height_range=height_range,
+                                  bisect=bisect, arrival_times=self.arrival_times(car, backwards),
+                                  predicate_results=predicate_results, interpolate=interpolate)
+            self._intercepts[key] = intercept
+        return intercept
+
+    def arrival_times(self, car: Car, backwards: bool = False) -> ArrivalTimes:
+        """Estimated arrival times of `car` at the current prediction's slices, computed as they are read
+        and shared by every intercept search for that car and direction until the next tick."""
+        prediction = self.ball_predictions
+        state = (prediction.version, len(prediction))
+        entry = self._arrival_times.get((car.id, backwards))
+        if entry is None or entry[0] != state:
+            entry = state, ArrivalTimes(car, prediction, backwards)
+            self._arrival_times[(car.id, backwards)] = entry
+            opposite = self._arrival_times.get((car.id, not backwards))
+            if opposite is not None and opposite[0] == state:
+                entry[1].pair_with(opposite[1])
+        return entry[1]
+
+    def _reusable_prediction_slices(self, dt: float) -> int:
+        """Number of leading slices to drop so last tick's trajectory can continue from the current ball,
+        or 0 when the ball has been touched or diverged from it and a full resimulation is needed."""
+        if not self.settings.object_mode.incremental_ball_prediction or not self._prediction_is_internal:
+            return 0
+        return reusable_slice_count(self.ball_predictions, self._prediction_dt, self._prediction_touch_time,
+                                    self.ball, self.time, dt, self._ball_touch_time)
+
+    def _prediction_cache_key_for_ball(self) -> Tuple:
+        def quantize(vector, resolution: float) -> Tuple[int, int, int]:
+            return round(vector[0] / resolution), round(vector[1] / resolution), round(vector[2] / resolution)
+
+        dt = self._prediction_dt
+        return (
+            quantize(self.ball.position, self.PREDICTION_CACHE_POSITION_RESOLUTION),
+            quantize(self.ball.velocity, self.PREDICTION_CACHE_VELOCITY_RESOLUTION),
+            quantize(self.ball.angular_velocity, self.PREDICTION_CACHE_ANGULAR_VELOCITY_RESOLUTION),
+            self.object_mode,
+            dt,
+            self._coarse_prediction_steps(dt),
+            self.settings.object_mode.prediction_fine_horizon,
+        )
+
+    def _load_cached_prediction(self) -> bool:
+        """Start from a cached trajectory for the current ball state, otherwise remember the key
+        so the trajectory simulated from scratch is cached when the prediction is replaced."""
+        key = self._prediction_cache_key_for_ball()
+        max_count = max(1, math.ceil(self._prediction_duration / self._prediction_dt - 1e-6))
+        coarse_from = self.prediction_cache.restore(key, self.ball_predictions, self.ball.time, max_count)
+        if coarse_from is None:
+            self._prediction_cache_key = key
+            self._prediction_cache_start = self.ball.time
+            return False
+
+        self._prediction_cursor = self._ball_from_slice(self.ball_predictions[-1])
+        self._coarse_prediction_from = coarse_from
+        self._schedule_internal_prediction()
+        return True
+
+    def _store_cached_prediction(self):
+        if self._prediction_cache_key is None:
+            return
+        self.prediction_cache.store(
+            self._prediction_cache_key, self.ball_predictions, self._prediction_cache_start, self._coarse_prediction_from
+        )
+        self._prediction_cache_key = None
 
     def _should_use_external_prediction(self) -> bool:
         if self._external_ball_prediction is None:
@@ -157,22 +380,78 @@ class GameInfo(Game):
             return self.settings.object_mode.use_rlbot_prediction_for_puck
         return self.settings.object_mode.use_rlbot_prediction_for_ball
 
-    def _predict_ball_internal(self, duration=5.0, dt=1 / 120):
-        prediction = Ball(self.ball)
+    def _schedule_internal_prediction(self):
+        """Promise slices up to the prediction horizon, simulated from the cursor when first read."""
+        dt = self._prediction_dt
+        remaining = self.time + self._prediction_duration - self._prediction_cursor.time
+        steps = max(0, math.ceil(remaining / dt - 1e-6))
+        self.ball_predictions.dt = dt
+        self.ball_predictions.extend_lazily(self.ball_predictions.count + steps, self._extend_internal_prediction)
+
+    def _coarse_prediction_steps(self, dt: float) -> int:
+        return max(1, round(1 / (self.settings.object_mode.prediction_coarse_rate * dt)))
+
+    def _extend_internal_prediction(self, count: int):
+        """Simulate slices up to `count`, coarsely past the fine horizon."""
+        dt = self._prediction_dt
+        coarse_from = simulate_ball_slices(
+            self.ball_predictions,
+            self._prediction_cursor,
+            count,
+            dt,
+            self._coarse_prediction_steps(dt),
+            self._prediction_time + self.settings.object_mode.prediction_fine_horizon,
+        )
+        self._coarse_prediction_from = min(self._coarse_prediction_from, coarse_from)
+
+    def _refine_reused_prediction(self):
+        """Simulate again at full rate the reused slices that were simulated coarsely but are now within
+        the fine horizon, from the last finely simulated slice. The coarse slices after them are kept."""
+        fine_until = self.time + self.settings.object_mode.prediction_fine_horizon
+        if self._coarse_prediction_from >= fine_until:
+            return
 
-        while prediction.time < self.time + duration:
-            prediction.step(dt)
-            self._add_prediction_slice(Ball(prediction))
+        prediction = self.ball_predictions
+        start = bisect_right(prediction.time, self._coarse_prediction_from + 1e-6, 0, prediction.count)
+        cursor = self._ball_from_slice(prediction[start - 1]) if start else Ball(self.ball)
+        refined = refine_ball_slices(prediction, cursor, start, self._prediction_dt, fine_until)
+        if refined < prediction.count:
+            self._coarse_prediction_from = prediction.time[refined - 1]
+        else:
+            self._prediction_cursor = cursor
+            self._coarse_prediction_from = math.inf
+
+    def _ball_from_slice(self, ball_slice) -> Ball:
+        ball = Ball(self.ball)
+        ball.time = ball_slice.time
+        ball.position = ball_slice.position
+        ball.velocity = ball_slice.velocity
+        ball.angular_velocity = ball_slice.angular_velocity
+        return ball
 
     @staticmethod
-    def _vec3_from_packet_obj(packet_vector) -> vec3:
+    def _xyz_from_packet_obj(packet_vector) -> Tuple[float, float, float]:
         x = getattr(packet_vector, "x", getattr(packet_vector, "X", 0.0))
         y = getattr(packet_vector, "y", getattr(packet_vector, "Y", 0.0))
         z = getattr(packet_vector, "z", getattr(packet_vector, "Z", 0.0))
-        return vec3(x, y, z)
+        return x, y, z
 
     def _predict_ball_external(self, duration: float, dt: float) -> bool:
         prediction = self._external_ball_prediction
+        step = max(1, int(round(dt / (1 / 60))))
+        start_time = self.time + 1e-4
+        end_time = self.time + duration
+
+        self.ball_predictions.dt = step / 60
+        if is_ball_prediction_struct(prediction):
+            try:
+                view = BallPredictionStructView(prediction)
+            except TypeError:
+                return False
+            self.ball_predictions.assign(view.select(start_time, end_time, step))
+            return bool(self.ball_predictions)
+
+        # slow path for anything that only looks like RLBot's struct, e.g. mocks
         slices = getattr(prediction, "slices", None)
         if slices is None:
             return False
@@ -187,10 +466,6 @@ class GameInfo(Game):
         if num_slices <= 0:
             return False
 
-        step = max(1, int(round(dt / (1 / 60))))
-        start_time = self.time + 1e-4
-        end_time = self.time + duration
-
         for i in range(0, num_slices, step):
             prediction_slice = slices[i]
             prediction_time = float(getattr(prediction_slice, "game_seconds", -1.0))
@@ -201,28 +476,17 @@ class GameInfo(Game):
 
             try:
                 physics = prediction_slice.physics
-                ball = Ball(self.ball)
-                ball.time = prediction_time
-                ball.position = self._vec3_from_packet_obj(physics.location)
-                ball.velocity = self._vec3_from_packet_obj(physics.velocity)
-                ball.angular_velocity = self._vec3_from_packet_obj(physics.angular_velocity)
-                self._add_prediction_slice(ball)
+                self.ball_predictions.append(
+                    prediction_time,
+                    self._xyz_from_packet_obj(physics.location),
+                    self._xyz_from_packet_obj(physics.velocity),
+                    self._xyz_from_packet_obj(physics.angular_velocity),
+                )
             except AttributeError:
                 continue
 
         return bool(self.ball_predictions)
 
-    def _add_prediction_slice(self, ball: Ball):
-        self.ball_predictions.append(ball)
-
-        if self.time_of_goal == -1:
-            if self.my_goal.inside(ball.position):
-                self.about_to_be_scored_on = True
-                self.time_of_goal = ball.time
-            if self.their_goal.inside(ball.position):
-                self.about_to_score = True
-                self.time_of_goal = ball.time
-
     @staticmethod
     def predict_car_drive(car: Car, time_limit=2.0, dt=1 / 60) -> List[vec3]:
         """Simple prediction of a driving car assuming no acceleration."""
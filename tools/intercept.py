@@ -1,15 +1,20 @@
 import math
-from typing import Callable, Optional, Sequence
+from array import array
+from typing import Callable, Dict, Optional, Sequence, Tuple
 
-from data.acceleration_lut import BOOST, THROTTLE
-from rlutilities.linear_algebra import angle_between, dot, norm
-from rlutilities.mechanics import Drive
+from data.arrival_table import arrival_table
+from data.turning_table import turning_table
+from rlutilities.linear_algebra import dot, norm
 from rlutilities.simulation import Car, Ball
 
-from tools.vector_math import direction, ground, ground_distance
+from tools.ball_prediction import BallPrediction
+from tools.intercept_search import candidate_indices, first_reachable_index, reach_time
+from tools.vector_math import ground
 
 
 class Intercept:
+    STRIDE = 3
+
     def __init__(
         self,
         car: Car,
@@ -17,7 +22,23 @@ class Intercept:
         predicate: Optional[Callable[[Car, Ball], bool]] = None,
         ignore_time_estimate: bool = False,
         backwards: bool = False,
+        height_range: Optional[Tuple[float, float]] = None,
+        bisect: bool = False,
+        arrival_times: Optional["ArrivalTimes"] = None,
+        predicate_results: Optional[Dict[int, bool]] = None,
+        interpolate: bool = False,
     ):
+        """`height_range` (inclusive) may be given when the predicate can only accept slices in that
+        height band, then only those slices are checked, using the prediction's height runs.
+        With `bisect`, the first reachable slice is found exactly by bracketing and bisection, and the search
+        continues on the grid of slices it checks without bisection, so it never settles on a later slice,
+        falling back to scanning when reachability is erratic.
+        `arrival_times` lets several searches for the same car and direction share arrival estimates,
+        and `predicate_results` lets searches with the same predicate share its results by slice index.
+        With `interpolate`, the time and ball state are interpolated to where the time margin crosses zero
+        before the found slice, instead of snapping to it. The crossing is searched for back to the last
+        checked slice, since the slices skipped in between may be reachable and accepted too. It is only
+        interpolated towards an unreachable slice, and the interpolated ball has to pass the predicate."""
         self.ball: Ball = Ball()
         self.ball.time = math.inf
         self.car: Car = car
@@ -25,12 +46,64 @@ class Intercept:
         self.predicate_later_than_time: bool = False  # whether the time constraint was satisfied sooner than the predicate
         found_ball = False
 
-        for i in range(0, len(ball_predictions), 3):
-            ball = ball_predictions[i]
-            time = estimate_time(car, ball.position, -1 if backwards else 1)
-            if time < ball.time - car.time or ignore_time_estimate:
-                if predicate is None or predicate(car, ball):
-                    self.ball = ball
+        car_time = car.time
+        first = 0  # index the search starts from
+        margin: Optional[Callable[[int], float]] = None
+
+        if isinstance(ball_predictions, BallPrediction):
+            # read the prediction columns directly, so no slice objects are made just to check reachability
+            prediction = ball_predictions
+            if arrival_times is None or arrival_times.prediction is not prediction or len(arrival_times) != len(prediction):
+                arrival_times = ArrivalTimes(car, prediction, backwards)
+            margin = arrival_times.margin
+
+            def reachable(i: int) -> bool:
+                return ignore_time_estimate or margin(i) > 0
+
+            if bisect and not ignore_time_estimate:
+                first = first_reachable_index(margin, len(prediction), self.STRIDE)
+        else:
+            time_to = ArrivalEstimator(car, -1 if backwards else 1).time_to
+
+            def reachable(i: int) -> bool:
+                if ignore_time_estimate:
+                    return True
+                ball = ball_predictions[i]
+                position = ball.position
+                return time_to(position[0], position[1], position[2]) < ball.time - car_time
+
+        stride = self.STRIDE
+        spans = None
+        if height_range is not None and isinstance(ball_predictions, BallPrediction):
+            spans = ball_predictions.height_spans(*height_range)
+
+        def accepts(i: int) -> bool:
+            if spans is not None and not height_range[0] <= ball_predictions.position_z[i] <= height_range[1]:
+                # slices outside the height band can't be accepted, so the predicate isn't run on them
+                return False
+            if predicate is None:
+                return True
+            if predicate_results is not None and i in predicate_results:
+                return predicate_results[i]
+            result = predicate(car, ball_predictions[i])
+            if predicate_results is not None:
+                predicate_results[i] = result
+            return result
+
+        last_checked = first - stride
+        for i in candidate_indices(len(ball_predictions), stride, first, spans):
+            if i - stride > last_checked:
+                # the slices skipped since the last check failed the predicate, so only reachability set the flag
+                self.predicate_later_than_time = reachable(i - stride)
+            unchecked_from, last_checked = max(last_checked + 1, 0), i
+
+            if reachable(i):
+                if accepts(i):
+                    self.ball = copy_ball(ball_predictions[i])
+                    if interpolate and margin is not None and not ignore_time_estimate and i > 0:
+                        self.ball = self._interpolated_ball(
+                            ball_predictions, margin, i, unchecked_from, accepts, predicate
+                        )
                     found_ball = True
                     break
                 self.predicate_later_than_time = True
@@ -40,42 +113,133 @@ class Intercept:
         # if no slice is found, use the last one
         if not found_ball:
             if ball_predictions:
-                self.ball = ball_predictions[-1]
+                last_stride = (len(ball_predictions) - 1) // stride * stride
+                if last_stride > last_checked:
+                    self.predicate_later_than_time = reachable(last_stride)
+                self.ball = copy_ball(ball_predictions[-1])
             self.is_viable = False
         self.time = self.ball.time
         self.ground_pos = ground(self.ball.position)
         self.position = self.ball.position
 
+    def _interpolated_ball(
+        self,
+        prediction: BallPrediction,
+        margin: Callable[[int], float],
+        index: int,
+        unchecked_from: int,
+        accepts: Callable[[int], bool],
+        predicate: Optional[Callable[[Car, Ball], bool]],
+    ) -> Ball:
+        """Ball where the time margin linearly crosses zero before the accepted slice `index`, looking back
+        over the unchecked slices from `unchecked_from` on while they are accepted too. Falls back to the
+        first accepted slice when the interpolated ball isn't accepted."""
+        index, time = reach_time(prediction.time, margin, index, unchecked_from, accepts)
+        ball = copy_ball(prediction[index])
+        if time != prediction.time[index]:
+            interpolated = copy_ball(prediction.slice_at(time, interpolate=True))
+            if predicate is None or predicate(self.car, interpolated):
+                ball = interpolated
+        return ball
+
+
+def copy_ball(ball) -> Ball:
+    """Detach a prediction slice (or Ball) from the prediction buffer, which gets reused every tick."""
+    copy = Ball()
+    copy.time = ball.time
+    copy.position = ball.position
+    copy.velocity = ball.velocity
+    copy.angular_velocity = ball.angular_velocity
+    return copy
+
+
+class ArrivalEstimator:
+    """`estimate_time` for one car and driving direction. Everything that does not depend on the target
+    is computed once, so estimating many targets does no vector math or allocations per target."""
+
+    def __init__(self, car: Car, dd: int = 1):
+        self.dd = dd
+        position = car.position
+        self.x, self.y = position[0], position[1]
+        forward = car.forward()
+        forward_length = math.hypot(forward[0], forward[1]) or 1.0
+        self.fx, self.fy = forward[0] * dd / forward_length, forward[1] * dd / forward_length
+
+        speed = dot(car.velocity, forward) * dd
+        if speed <= 1:
+            speed = max(norm(car.velocity), 600.0)
+        self.speed = speed
+
+        self.curve = arrival_table().curve(speed, car.boost if dd > 0 else 0.0)
+        self.turning = turning_table()
+        self.turning_layers = self.turning.speed_layers(speed)
+
+    def time_to(self, x: float, y: float, z: float) -> float:
+        cos_angle, dist = self.geometry(x, y, z)
+        return self.time_for(cos_angle, dist)
+
+    def geometry(self, x: float, y: float, z: float) -> Tuple[float, float]:
+        """Cosine of the heading error on the ground towards the target, and the ground distance left after
+        the first 200 uu. Driving the other way only flips the sign of the cosine."""
+        dx, dy = x - self.x, y - self.y
+        ground_distance = math.sqrt(dx * dx + dy * dy)
+        cos_angle = (self.fx * dx + self.fy * dy) / ground_distance if ground_distance > 0 else self.fx
+        return cos_angle, ground_distance - 200
+
+    def time_for(self, cos_angle: float, dist: float) -> float:
+        heading_error = math.acos(max(-1.0, min(1.0, cos_angle)))
+        turning = self.turning.time_in_layers(self.turning_layers, heading_error, dist + 200)
+        if dist < 0:
+            return turning
+        return self.curve.time(dist) * 1.05 + turning
+
+
+class ArrivalTimes:
+    """Arrival time estimates of one car at the slices of a BallPrediction, each computed on first use,
+    so intercept searches for the same car and direction can share them."""
+
+    def __init__(self, car: Car, prediction: BallPrediction, backwards: bool = False):
+        self.prediction = prediction
+        self.car_time = car.time
+        self._estimator = ArrivalEstimator(car, -1 if backwards else 1)
+        self._estimates = array("d", [math.nan]) * len(prediction)
+        self._opposite: Optional[ArrivalTimes] = None
+
+    def pair_with(self, opposite: "ArrivalTimes"):
+        """Estimate `opposite`, the same car driving the other way, along with every slice estimated here
+        and the other way around, sharing the geometry of the slice."""
+        self._opposite, opposite._opposite = opposite, self
+
+    def __len__(self) -> int:
+        return len(self._estimates)
+
+    def __getitem__(self, index: int) -> float:
+        estimate = self._estimates[index]
+        if estimate != estimate:  # not estimated yet
+            prediction = self.prediction
+            if index >= prediction.count:
+                prediction.materialize(index + 1)
+            cos_angle, dist = self._estimator.geometry(prediction.position_x[index], prediction.position_y[index],
+                                                       prediction.position_z[index])
+            estimate = self._estimator.time_for(cos_angle, dist)
+            self._estimates[index] = estimate
+            opposite = self._opposite
+            if opposite is not None and index < len(opposite._estimates):
+                opposite._estimates[index] = opposite._estimator.time_for(-cos_angle, dist)
+        return estimate
+
+    def margin(self, index: int) -> float:
+        """How much earlier than the ball the car can get to the slice, negative when it is too late."""
+        estimate = self[index]
+        return self.prediction.time[index] - self.car_time - estimate
+
 
 def estimate_time(car: Car, target, dd: int = 1) -> float:
-    turning_radius = 1 / Drive.max_turning_curvature(norm(car.velocity) + 500)
-    turning = angle_between(car.forward() * dd, direction(car, target)) * turning_radius / 1800
-    if turning < 0.5:
-        turning = 0
-
-    dist = ground_distance(car, target) - 200
-    if dist < 0:
-        return turning
-    speed = dot(car.velocity, car.forward()) * dd
-    if speed <= 1:
-        speed = max(norm(car.velocity), 600.0)
-
-    time = 0
-    result = None
-    if car.boost > 0 and dd > 0:
-        boost_time = car.boost / 33.33
-        result = BOOST.simulate_until_limit(speed, distance_limit=dist, time_limit=boost_time)
-        dist -= result.distance_traveled
-        time += result.time_passed
-        speed = result.speed_reached
-
-    if dist > 0 and speed < 1410:
-        result = THROTTLE.simulate_until_limit(speed, distance_limit=dist)
-        dist -= result.distance_traveled
-        time += result.time_passed
-        speed = result.speed_reached
-
-    if result is None or not result.distance_limit_reached:
-        time += dist / max(speed, 1.0)
-
-    return time * 1.05 + turning
+    return ArrivalEstimator(car, dd).time_to(target[0], target[1], target[2])
+
+
+def estimate_times(car: Car, target) -> Tuple[float, float]:
+    """estimate_time driving forwards and backwards, sharing the geometry."""
+    forward = ArrivalEstimator(car)
+    cos_angle, dist = forward.geometry(target[0], target[1], target[2])
+    return forward.time_for(cos_angle, dist), ArrivalEstimator(car, -1).time_for(-cos_angle, dist)
@@ -0,0 +1,79 @@
+import math
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+# time margin of a slice by index: how much earlier than the ball the car can get there, negative when too late
+Margin = Callable[[int], float]
+
+
+def first_reachable_index(margin: Margin, count: int, stride: int) -> int:
+    """Index of the first slice with a positive time margin, assuming the margin grows along the
+    prediction: doubling steps bracket it, then bisection finds it. When a step shows the margin
+    shrinking, an earlier reachable slice may have been stepped over, so 0 is returned to scan instead.
+    Returns `count` when no slice is reachable."""
+    previous_index, previous_margin = -1, -math.inf
+    index, step = 0, stride
+    while index < count:
+        current = margin(index)
+        if current > 0:
+            break
+        if current < previous_margin:
+            return 0
+        previous_index, previous_margin = index, current
+        if index == count - 1:
+            return count
+        index = min(index + step, count - 1)
+        step *= 2
+    else:
+        return count
+
+    low, high = previous_index, index
+    while high - low > 1:
+        middle = (low + high) // 2
+        if margin(middle) > 0:
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+def candidate_indices(
+    count: int, stride: int, first: int = 0, spans: Optional[Iterable[Tuple[int, int]]] = None
+) -> Iterator[int]:
+    """
+    `first`, then the indices after it on the grid of every `stride`-th slice from 0, within the
+    [start, end) index ranges of `spans` if given. Staying on the grid a scan from 0 checks means that
+    a search started at the first reachable slice never accepts a later slice than that scan.
+    `spans` are read as the search goes, in order, and a range may come again with a later end.
+    """
+    if spans is None:
+        spans = [(0, count)]
+    first_checked = first >= count
+    after = (first // stride + 1) * stride
+    for start, end in spans:
+        end = min(end, count)
+        if not first_checked and first < end:
+            first_checked = True
+            if start <= first:
+                yield first
+        start = max(start, after)
+        yield from range(-(-start // stride) * stride, end, stride)
+        after = max(after, end)
+
+def reach_time(
+    times: Sequence[float], margin: Margin, index: int, lowest: int, accepts: Optional[Callable[[int], bool]] = None
+) -> Tuple[int, float]:
+    """
+    For a reachable slice `index` found after skipping the slices from `lowest` on, the first slice of the
+    reachable run ending at it whose slices all pass `accepts`, and the time the margin linearly crosses zero
+    between that slice and the one before. The time is the slice's own when the slice before is reachable
+    too, since it was rejected then, or when there is none.
+    """
+    while index > lowest and margin(index - 1) > 0 and (accepts is None or accepts(index - 1)):
+        index -= 1
+    if index == 0:
+        return index, times[index]
+    before, after = margin(index - 1), margin(index)
+    if before > 0:
+        return index, times[index]
+    t0, t1 = times[index - 1], times[index]
+    return index, t0 + (t1 - t0) * before / (before - after)
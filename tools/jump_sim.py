@@ -1,3 +1,8 @@
+import math
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+
 # TODO Replace with imports from RLU instead
 class vec3:
     def __init__(self, x: float, y: float, z: float):
@@ -59,6 +64,122 @@ class JumpSim:
 
         self.timer += dt
 
+
+JumpState = Tuple[float, float, float]  # time, height, vertical velocity
+
+
+class BatchJumpSim:
+    """
+    JumpSim for many jumps at once, one lane per jump, all starting at the same time.
+    Lanes are stored as flat float arrays and updated in place, and each lane stops being stepped
+    once it is done or, with `until_apex`, once it falls after its last jump.
+    A second jump time of math.inf means the lane only jumps once.
+    """
+
+    def __init__(self, first_hold_durations: Sequence[float], second_jump_times: Sequence[float],
+                 initial_velocities: Optional[Sequence[Sequence[float]]] = None,
+                 initial_positions: Optional[Sequence[Sequence[float]]] = None,
+                 ups: Optional[Sequence[Sequence[float]]] = None):
+        count = len(first_hold_durations)
+        assert len(second_jump_times) == count
+        for hold, second in zip(first_hold_durations, second_jump_times):
+            assert 0.0 < hold <= MAX_FIRST_HOLD_DURATION
+            assert hold < second
+
+        def columns(vectors: Optional[Sequence[Sequence[float]]], default: Tuple[float, float, float]):
+            vectors = vectors if vectors is not None else [default] * count
+            assert len(vectors) == count
+            return tuple(array("d", (vector[axis] for vector in vectors)) for axis in range(3))
+
+        self.px, self.py, self.pz = columns(initial_positions, (0.0, 0.0, 0.0))
+        self.vx, self.vy, self.vz = columns(initial_velocities, (0.0, 0.0, 0.0))
+        self.ux, self.uy, self.uz = columns(ups, (0.0, 0.0, 1.0))
+        self.first_hold_durations = array("d", first_hold_durations)
+        self.second_jump_times = array("d", second_jump_times)
+
+        self.jumped_twice = [False] * count
+        self.done = [False] * count
+        self.timer = 0.0
+        self.active = list(range(count))  # lanes still being stepped
+        self.states: List[List[JumpState]] = [[(0.0, self.pz[i], self.vz[i])] for i in range(count)]
+
+    def step(self, dt: float, until_apex: bool = False):
+        timer = self.timer
+        px, py, pz, vx, vy, vz = self.px, self.py, self.pz, self.vx, self.vy, self.vz
+        ux, uy, uz = self.ux, self.uy, self.uz
+        first_hold_durations, second_jump_times = self.first_hold_durations, self.second_jump_times
+        jumped_twice, done, states = self.jumped_twice, self.done, self.states
+        gravity = GRAVITY[2] * dt
+        next_timer = timer + dt
+
+        still_active = []
+        for i in self.active:
+            if timer == 0.0:
+                vx[i] += ux[i] * SINGLE_TICK_ACC
+                vy[i] += uy[i] * SINGLE_TICK_ACC
+                vz[i] += uz[i] * SINGLE_TICK_ACC
+            elif timer <= first_hold_durations[i]:
+                vx[i] += ux[i] * FIRST_JUMP_ACC * dt
+                vy[i] += uy[i] * FIRST_JUMP_ACC * dt
+                vz[i] += uz[i] * FIRST_JUMP_ACC * dt
+            elif not jumped_twice[i] and timer >= second_jump_times[i]:
+                vx[i] += ux[i] * SINGLE_TICK_ACC
+                vy[i] += uy[i] * SINGLE_TICK_ACC
+                vz[i] += uz[i] * SINGLE_TICK_ACC
+                jumped_twice[i] = True
+
+            vz[i] += gravity
+            px[i] += vx[i] * dt
+            py[i] += vy[i] * dt
+            pz[i] += vz[i] * dt
+            states[i].append((next_timer, pz[i], vz[i]))
+
+            if pz[i] <= 0.0 or timer > 10.0:
+                done[i] = True
+            elif not until_apex or vz[i] >= 0 or (not jumped_twice[i] and second_jump_times[i] != math.inf):
+                still_active.append(i)  # still rising, or a second jump is still to come
+
+        self.active = still_active
+        self.timer = next_timer
+
+    def simulate(self, dt: float, until_apex: bool = True) -> List[List[JumpState]]:
+        """Step every lane until it is done (or past its apex), and return the states of each lane."""
+        while self.active:
+            self.step(dt, until_apex)
+        return self.states
+
+    def apexes(self) -> List[JumpState]:
+        """The highest state of each lane so far."""
+        return [max(states, key=lambda state: state[1]) for states in self.states]
+
+    def height_curves(self, heights: Sequence[float]) -> List[Tuple[List[float], List[float]]]:
+        """height_curve of each lane."""
+        return [height_curve(states, heights) for states in self.states]
+
+
+def height_curve(states: Sequence[JumpState], heights: Sequence[float]) -> Tuple[List[float], List[float]]:
+    """Times at which a simulated jump first reaches each height, and the vertical velocities there,
+    interpolated between ticks. Heights it never reaches get the time of the apex and no velocity."""
+    apex = max(range(len(states)), key=lambda i: states[i][1])
+    times, velocities = [], []
+    i = 0
+    for height in heights:
+        while i <= apex and states[i][1] < height:
+            i += 1
+        if i > apex:
+            times.append(states[apex][0])
+            velocities.append(0.0)
+        elif i == 0:
+            times.append(0.0)
+            velocities.append(states[0][2])
+        else:
+            (t0, z0, v0), (t1, z1, v1) = states[i - 1], states[i]
+            ratio = (height - z0) / (z1 - z0)
+            times.append(t0 + (t1 - t0) * ratio)
+            velocities.append(v0 + (v1 - v0) * ratio)
+    return times, velocities
+
+
 if __name__ == "__main__":
     import matplotlib.pyplot as plt
 